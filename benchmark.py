@@ -0,0 +1,264 @@
+# Offline benchmarks for the Hackcheck bot's hot paths.
+#
+# Starts a local stand-in for the HackCheck API (paginated results, configurable latency and
+# 429s) and times the API crawl, message formatting and report generation at several result
+# sizes, without touching the real API or Discord. Run it from the bot's directory so
+# config.json is found:
+#
+#   python benchmark.py
+#   python benchmark.py --sizes 10,1000 --latency 0.05 --rate-limited 0.1
+#   python benchmark.py --save baseline.json
+#   python benchmark.py --compare baseline.json   # exits 1 if a stage got slower
+
+
+import argparse
+import asyncio
+import gc
+import json
+import logging
+import math
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+from aiohttp import web
+
+import hackcheckbot as hb
+
+
+STAGES = ("api", "format", "csv", "pdf")
+
+
+def make_row(index):
+    return {
+        "email": f"user{index}@example{index % 97}.com",
+        "password": f"hunter{index * 7919 % 100000}",
+        "username": f"user_{index}",
+        "full_name": f"Test User {index}" if index % 3 else None,
+        "ip_address": f"10.{index >> 16 & 255}.{index >> 8 & 255}.{index & 255}",
+        "phone_number": f"+1555{index % 10000000:07d}" if index % 5 == 0 else None,
+        "hash": f"{index * 2654435761 % 2 ** 32:08x}" * 4 if index % 4 == 0 else None,
+        "source": {"name": f"Breach {index % 40}", "date": f"20{10 + index % 14}-0{1 + index % 9}"},
+    }
+
+
+class FakeHackCheckApi:
+    """aiohttp app answering /search/{key}/{type}/{term} like the HackCheck API.
+
+    The term is the number of results to serve, so each benchmark size is its own search.
+    """
+
+    def __init__(self, latency=0.0, rate_limited=0.0, report_total=False, host="127.0.0.1", port=0):
+        self.latency = latency
+        self.rate_limited = rate_limited
+        self.report_total = report_total
+        self.host = host
+        self.port = port
+        self.rows = []
+        self.requests = 0
+        self.runner = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/search/{key}/{type}/{term}", self.search)
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        await web.TCPSite(self.runner, self.host, self.port).start()
+        self.port = self.runner.addresses[0][1]
+
+    async def close(self):
+        await self.runner.cleanup()
+
+    def prepare(self, total):
+        """Generates the rows up front, so building them isn't measured as part of a crawl."""
+        while len(self.rows) < total:
+            self.rows.append(make_row(len(self.rows)))
+
+    async def search(self, request):
+        self.requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if random.random() < self.rate_limited:
+            return web.json_response({"error": "Too many requests"}, status=429, headers={"Retry-After": "0.1"})
+
+        try:
+            total = int(request.match_info["term"])
+        except ValueError:
+            return web.json_response({"error": "Invalid search term"}, status=400)
+        offset = int(request.query.get("offset", 0))
+        limit = int(request.query.get("limit", 75))
+        self.prepare(total)
+
+        pagination = {}
+        if offset + limit < total:
+            pagination["next"] = {"offset": offset + limit, "limit": limit}
+        if self.report_total:
+            pagination["total"] = total
+        return web.json_response({"results": self.rows[offset:min(offset + limit, total)], "pagination": pagination})
+
+
+async def crawl(client, scheduler, size):
+    results = hb.BreachResults()
+    max_pages = math.ceil(size / 75) + 1
+    async for batch in hb.make_hackcheck_request(client, scheduler, "domain", str(size), max_pages=max_pages):
+        if "error" in batch:
+            raise RuntimeError(batch["error"])
+        results.extend(batch["results"])
+    return results
+
+
+def measure(func, repeat):
+    """Runs func once under tracemalloc for the peak, then repeat times for timings."""
+    gc.collect()
+    tracemalloc.start()
+    result = func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return result, timings, peak
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, math.ceil(q * len(ordered)) - 1)]
+
+
+def summarize(stage, size, timings, peak):
+    p50 = statistics.median(timings)
+    return {
+        "stage": stage,
+        "rows": size,
+        "runs": len(timings),
+        "p50": p50,
+        "p99": percentile(timings, 0.99),
+        "rows_per_second": size / p50 if p50 else 0,
+        "peak_bytes": peak,
+    }
+
+
+def run_benchmarks(args):
+    api = FakeHackCheckApi(args.latency, args.rate_limited, args.report_total)
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    loop.run_until_complete(api.start())
+    api.prepare(max(args.sizes))
+    hb.config["hackcheck_api_url"] = api.url
+    hb.config["max_concurrent_pages"] = args.concurrency
+    client = hb.HttpClient()
+    loop.run_until_complete(client.start())
+    # The stand-in has no quota; keep the scheduler in the path without letting it set the pace.
+    scheduler = hb.ApiScheduler(rate=args.api_rate, period=1, user_per_minute=0, guild_per_minute=0)
+
+    summaries = []
+    try:
+        for size in args.sizes:
+            results = None
+            for stage in args.stages:
+                if stage == "api":
+                    results, timings, peak = measure(lambda: loop.run_until_complete(crawl(client, scheduler, size)), args.repeat)
+                else:
+                    if results is None:
+                        results = hb.BreachResults.from_dicts(make_row(index) for index in range(size))
+                    if stage == "format":
+                        rows = {"results": results}
+                        func = lambda: hb.format_breaches("example.com", "domain", rows)
+                    elif stage == "csv":
+                        func = lambda: hb.create_csv_report(results)
+                    else:
+                        func = lambda: hb.create_pdf_report(results)
+                    _, timings, peak = measure(func, args.pdf_repeat if stage == "pdf" else args.repeat)
+
+                summary = summarize(stage, size, timings, peak)
+                summaries.append(summary)
+                print_row(summary)
+    finally:
+        scheduler.close()
+        loop.run_until_complete(client.close())
+        loop.run_until_complete(api.close())
+        loop.close()
+    return summaries
+
+
+def print_header():
+    print(f"{'stage':<8}{'rows':>8}{'runs':>6}{'p50 ms':>12}{'p99 ms':>12}{'rows/s':>14}{'peak MiB':>11}")
+
+
+def print_row(summary):
+    print(f"{summary['stage']:<8}{summary['rows']:>8}{summary['runs']:>6}{summary['p50'] * 1000:>12.2f}"
+          f"{summary['p99'] * 1000:>12.2f}{summary['rows_per_second']:>14,.0f}{summary['peak_bytes'] / 2 ** 20:>11.1f}")
+
+
+def compare(summaries, baseline_path, tolerance):
+    """Prints stages whose p50 grew by more than tolerance over the baseline; returns how many did."""
+    with open(baseline_path, "r") as baseline_file:
+        baseline = {(entry["stage"], entry["rows"]): entry for entry in json.load(baseline_file)}
+
+    regressions = 0
+    for summary in summaries:
+        before = baseline.get((summary["stage"], summary["rows"]))
+        if not before:
+            continue
+        change = summary["p50"] / before["p50"] - 1 if before["p50"] else 0
+        if change > tolerance:
+            regressions += 1
+            print(f"REGRESSION {summary['stage']} at {summary['rows']} rows: p50 {before['p50'] * 1000:.2f} ms -> {summary['p50'] * 1000:.2f} ms ({change:+.0%})")
+    return regressions
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Benchmark the Hackcheck bot against a local HackCheck API stand-in.")
+    parser.add_argument("--sizes", default="10,1000,10000,50000", help="comma-separated result counts (default: %(default)s)")
+    parser.add_argument("--stages", default=",".join(STAGES), help="comma-separated stages to run (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per stage (default: %(default)s)")
+    parser.add_argument("--pdf-repeat", type=int, default=2, help="timed runs of the PDF stage (default: %(default)s)")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds the fake API waits per page (default: %(default)s)")
+    parser.add_argument("--rate-limited", type=float, default=0.0, help="fraction of pages answered with a 429 (default: %(default)s)")
+    parser.add_argument("--report-total", action="store_true", help="include the result total in the fake API's pagination")
+    parser.add_argument("--concurrency", type=int, default=hb.config.get("max_concurrent_pages", 4), help="pages fetched in parallel (default: %(default)s)")
+    parser.add_argument("--api-rate", type=int, default=1000, help="API requests per second the scheduler allows (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for the simulated 429s (default: %(default)s)")
+    parser.add_argument("--save", metavar="PATH", help="write the results as JSON")
+    parser.add_argument("--compare", metavar="PATH", help="compare against results saved with --save")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed p50 slowdown against --compare (default: %(default)s)")
+    parser.add_argument("--verbose", action="store_true", help="show the bot's log output")
+    args = parser.parse_args(argv)
+
+    args.sizes = [int(size) for size in args.sizes.split(",")]
+    args.stages = [stage for stage in args.stages.split(",") if stage]
+    unknown = set(args.stages) - set(STAGES)
+    if unknown:
+        parser.error(f"unknown stages: {', '.join(sorted(unknown))}")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if not args.verbose:
+        logging.getLogger().setLevel(logging.ERROR)
+    random.seed(args.seed)
+
+    print_header()
+    summaries = run_benchmarks(args)
+
+    if args.save:
+        with open(args.save, "w") as save_file:
+            json.dump(summaries, save_file, indent=2)
+    if args.compare and compare(summaries, args.compare, args.tolerance):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -19,6 +19,25 @@ import os
 import io
 import traceback
 import re
+import time
+import hashlib
+import sqlite3
+import zlib
+import gzip
+import zipfile
+import math
+import random
+import bisect
+import cProfile
+import pstats
+import threading
+import inspect
+import typing
+import signal
+import multiprocessing
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from collections import OrderedDict, Counter, deque
 from datetime import datetime
 from xml.sax.saxutils import escape
 
@@ -28,34 +47,49 @@ from discord.ui import Button, View
 from discord import ButtonStyle
 
 import aiohttp
-from aiohttp import ClientTimeout, ClientError, ClientResponseError, ServerTimeoutError
+from aiohttp import ClientTimeout, ClientError, ClientResponseError, ServerTimeoutError, web
 import requests
 
-from aiolimiter import AsyncLimiter
-limiter = AsyncLimiter(8, 1)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None
 
 from reportlab.lib.pagesizes import elevenSeventeen, landscape
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Flowable
 from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.styles import ParagraphStyle
 from reportlab.lib.enums import TA_LEFT
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.lib.utils import simpleSplit
 import csv
-import ast 
 
 from datetime import datetime, timedelta
 
+def log_file_handler(filename):
+    return RotatingFileHandler(filename, maxBytes=5*1024*1024, backupCount=2, encoding='utf-8', mode='a')
+
+
+# A rotating log can't be shared between processes, so spawned processes (cluster workers and
+# report renderers) only log to stderr here; each cluster worker opens its own log in run_worker.
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(), 
-        RotatingFileHandler('hackcheck.log', maxBytes=5*1024*1024, backupCount=2, encoding='utf-8', mode='a')  
-    ]
+    handlers=[logging.StreamHandler()] + ([log_file_handler('hackcheck.log')] if multiprocessing.parent_process() is None else [])
 )
 logging.getLogger('discord').setLevel(logging.WARNING)
 
 
-timeout = ClientTimeout(total=120)
 retry_attempts = 3
 backoff_factor = 0.5
 
@@ -77,76 +111,1151 @@ def load_config():
 
 config = load_config()
 
+api_timeout = ClientTimeout(total=config.get("api_timeout", 120), sock_connect=10)
+webhook_timeout = ClientTimeout(total=config.get("webhook_timeout", 15), sock_connect=5)
+
+
+class HttpClient:
+    """Long-lived pooled HTTP session shared by the HackCheck API and webhook calls."""
+
+    def __init__(self, limit=100, limit_per_host=16, keepalive_timeout=30, dns_cache_ttl=300):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self.timeouts = {"api": api_timeout, "webhook": webhook_timeout}
+        self.session = None
+
+    async def start(self):
+        if self.session and not self.session.closed:
+            return
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            use_dns_cache=True,
+            ttl_dns_cache=self.dns_cache_ttl,
+        )
+        self.session = aiohttp.ClientSession(connector=connector, timeout=api_timeout)
+        logging.info(f"HTTP client started (limit={self.limit}, per host={self.limit_per_host})")
+
+    async def close(self):
+        if self.session and not self.session.closed:
+            await self.session.close()
+        self.session = None
+
+    def get(self, url, profile="api", timeout=None, **kwargs):
+        return self.session.get(url, timeout=timeout or self.timeouts[profile], **kwargs)
+
+    def post(self, url, profile="webhook", **kwargs):
+        return self.session.post(url, timeout=self.timeouts[profile], **kwargs)
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+PAGE_COUNT_BUCKETS = (1, 2, 5, 10, 20, 40, 75)
+
+METRICS = {
+    "hackcheck_api_requests_total": ("counter", "HackCheck API page requests by response status."),
+    "hackcheck_api_page_seconds": ("histogram", "Latency of a single HackCheck API page request."),
+    "hackcheck_api_scheduler_wait_seconds": ("histogram", "Time a page request waited for an API request slot."),
+    "hackcheck_api_scheduler_timeouts_total": ("counter", "Page requests that ran out of time waiting for an API request slot."),
+    "hackcheck_searches_total": ("counter", "HackCheck API crawls by how they ended."),
+    "hackcheck_search_seconds": ("histogram", "Time to crawl every page of a search."),
+    "hackcheck_search_pages": ("histogram", "Result pages fetched per search."),
+    "hackcheck_search_queue_wait_seconds": ("histogram", "Time a search waited in the queue before starting."),
+    "hackcheck_search_queue_waiting": ("gauge", "Searches waiting for a worker."),
+    "hackcheck_search_queue_running": ("gauge", "Searches being processed."),
+    "hackcheck_searches_in_flight": ("gauge", "Distinct searches currently being fetched from the API."),
+    "hackcheck_result_cache_requests_total": ("counter", "Result cache lookups by result."),
+    "hackcheck_index_answers_total": ("counter", "Searches answered from the local index instead of the API."),
+    "hackcheck_index_values": ("gauge", "Distinct field values in the local index."),
+    "hackcheck_result_cache_entries": ("gauge", "Searches held in the result cache."),
+    "hackcheck_result_cache_bytes": ("gauge", "Estimated size of the result cache."),
+    "hackcheck_reports_total": ("counter", "Report renders by outcome."),
+    "hackcheck_report_render_seconds": ("histogram", "Time to render the CSV and PDF reports of a search."),
+    "hackcheck_report_jobs": ("gauge", "Report renders queued or running."),
+    "hackcheck_report_upload_seconds": ("histogram", "Time to upload the report files of a search."),
+    "hackcheck_report_upload_bytes_total": ("counter", "Report bytes uploaded, by format."),
+    "hackcheck_paginator_seconds": ("histogram", "Time to answer a paginator button press."),
+    "hackcheck_page_layouts": ("gauge", "Finished searches kept in memory for paging."),
+    "hackcheck_bulk_searches_total": ("counter", "Bulk searches completed."),
+    "hackcheck_bulk_terms_total": ("counter", "Terms checked by bulk searches."),
+    "hackcheck_watch_runs_total": ("counter", "Scheduled checks of watched searches by outcome."),
+    "hackcheck_watch_new_results_total": ("counter", "New results posted by watched searches."),
+    "hackcheck_webhook_queue_depth": ("gauge", "Webhook messages waiting for delivery."),
+    "hackcheck_webhook_dropped_total": ("counter", "Webhook messages dropped because the queue was full."),
+}
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "count", "sum")
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def merge(self, other):
+        for index, count in enumerate(other.counts):
+            self.counts[index] += count
+        self.count += other.count
+        self.sum += other.sum
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-th quantile, or None with no observations."""
+        if not self.count:
+            return None
+        seen = 0
+        for bound, count in zip(self.buckets + (math.inf,), self.counts):
+            seen += count
+            if seen >= q * self.count:
+                return bound
+        return math.inf
+
+
+class Metrics:
+    """In-process counters and latency histograms, rendered in the Prometheus text format.
+
+    Gauges and counters owned by other objects (queue depths, cache stats) are read at render time
+    from collectors that return (name, labels, value) tuples.
+    """
+
+    def __init__(self):
+        self.counters = {}
+        self.histograms = {}
+        self.collectors = []
+
+    def inc(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, value, buckets=LATENCY_BUCKETS, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = Histogram(buckets)
+        histogram.observe(value)
+
+    @contextmanager
+    def timer(self, name, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def add_collector(self, collector):
+        self.collectors.append(collector)
+
+    def collect(self):
+        values = dict(self.counters)
+        for collector in self.collectors:
+            try:
+                for name, labels, value in collector():
+                    values[(name, tuple(sorted(labels.items())))] = value
+            except Exception as e:
+                logging.error(f"Metrics collector failed: {type(e).__name__}: {e}")
+        return values
+
+    def total(self, name, values=None, **labels):
+        values = self.collect() if values is None else values
+        wanted = set(labels.items())
+        return sum(value for (key, key_labels), value in values.items() if key == name and wanted <= set(key_labels))
+
+    def histogram(self, name):
+        """All label sets of a histogram merged into one."""
+        merged = None
+        for (key, _), histogram in self.histograms.items():
+            if key == name:
+                if merged is None:
+                    merged = Histogram(histogram.buckets)
+                merged.merge(histogram)
+        return merged
+
+    def render(self):
+        lines = []
+        samples = {}
+        for (name, labels), value in self.collect().items():
+            samples.setdefault(name, []).append((labels, value))
+        for (name, labels), histogram in self.histograms.items():
+            samples.setdefault(name, []).append((labels, histogram))
+
+        for name in sorted(samples):
+            kind, description = METRICS.get(name, ("untyped", ""))
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in sorted(samples[name], key=lambda sample: sample[0]):
+                if isinstance(value, Histogram):
+                    cumulative = 0
+                    for bound, count in zip(value.buckets + (math.inf,), value.counts):
+                        cumulative += count
+                        le = "+Inf" if bound == math.inf else repr(float(bound))
+                        lines.append(f"{name}_bucket{format_labels(labels + (('le', le),))} {cumulative}")
+                    lines.append(f"{name}_sum{format_labels(labels)} {value.sum}")
+                    lines.append(f"{name}_count{format_labels(labels)} {value.count}")
+                else:
+                    lines.append(f"{name}{format_labels(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def format_labels(labels):
+    if not labels:
+        return ""
+    pairs = []
+    for key, value in labels:
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{key}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+metrics = Metrics()
+
+
+class MetricsServer:
+    """Serves the metrics at /metrics for a Prometheus scraper, on localhost by default."""
+
+    def __init__(self, metrics, host="127.0.0.1", port=9464):
+        self.metrics = metrics
+        self.host = host
+        self.port = port
+        self.runner = None
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/metrics", self.handle)
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        await web.TCPSite(self.runner, self.host, self.port).start()
+        logging.info(f"Serving metrics on http://{self.host}:{self.port}/metrics")
+
+    async def handle(self, request):
+        return web.Response(body=self.metrics.render().encode(), headers={"Content-Type": "text/plain; version=0.0.4; charset=utf-8"})
+
+    async def close(self):
+        if self.runner:
+            await self.runner.cleanup()
+            self.runner = None
+
+
+PROFILE_MODES = ("cprofile", "stack")
+
+
+class ProfilerBusy(Exception):
+    pass
+
+
+def frame_label(frame):
+    code = frame.f_code
+    return f"{getattr(code, 'co_qualname', code.co_name)} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+
+
+def blocking_coroutine(frame):
+    """Describes a stalled loop thread as 'coroutine blocked in function (file:line)'."""
+    innermost = frame
+    while frame is not None:
+        if frame.f_code.co_flags & (inspect.CO_COROUTINE | inspect.CO_ASYNC_GENERATOR):
+            code = frame.f_code
+            return f"{getattr(code, 'co_qualname', code.co_name)} blocked in {frame_label(innermost)}"
+        frame = frame.f_back
+    return f"a callback blocked in {frame_label(innermost)}"
+
+
+def collapse_stack(frame):
+    """Outermost-first 'a;b;c' stack, the input format of flamegraph tools."""
+    labels = []
+    while frame is not None:
+        code = frame.f_code
+        labels.append(f"{getattr(code, 'co_qualname', code.co_name)} ({os.path.basename(code.co_filename)})")
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+class LoopProfiler:
+    """Profiles the event loop thread for a fixed window, switched on at runtime by an admin.
+
+    While a window is open, a watchdog thread notices when the loop's heartbeat stops for longer
+    than the slow-callback threshold and records which coroutine was blocking it. The loop thread
+    is also profiled, either with cProfile or by sampling its stack, and the results are written
+    to output_dir.
+    """
+
+    def __init__(self, output_dir="profiles", sample_interval=0.005):
+        self.output_dir = output_dir
+        self.sample_interval = sample_interval
+        self.active = False
+        self.armed = None
+        self.beat = 0
+        self.threshold = 0.1
+        self.stalls = []
+        self.samples = Counter()
+
+    def search_started(self):
+        if self.armed and not self.armed.done():
+            self.armed.set_result(None)
+
+    async def run(self, mode="cprofile", seconds=30, threshold=0.1, wait_for_search=None):
+        """Profiles for seconds and returns the paths of the files written.
+
+        With wait_for_search, the window opens when the next search starts, or raises
+        asyncio.TimeoutError if none does within that many seconds.
+        """
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profiling mode: {mode}")
+        if self.active or self.armed:
+            raise ProfilerBusy("A profiling session is already running.")
+
+        loop = asyncio.get_running_loop()
+        if wait_for_search is not None:
+            self.armed = loop.create_future()
+            try:
+                await asyncio.wait_for(self.armed, wait_for_search)
+            finally:
+                self.armed = None
+
+        self.active = True
+        self.threshold = threshold
+        self.stalls = []
+        self.samples = Counter()
+        self.beat = time.monotonic()
+        started = time.time()
+        stop = threading.Event()
+        heartbeat = asyncio.create_task(self.heartbeat(threshold / 4))
+        watchdog = threading.Thread(target=self.watch, args=(threading.get_ident(), stop, mode == "stack"), name="loop-profiler", daemon=True)
+        profile = cProfile.Profile() if mode == "cprofile" else None
+
+        watchdog.start()
+        if profile:
+            profile.enable()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            if profile:
+                profile.disable()
+            stop.set()
+            heartbeat.cancel()
+            await loop.run_in_executor(None, watchdog.join)
+            self.active = False
+        return await loop.run_in_executor(None, self.write_report, mode, started, seconds, profile)
+
+    async def heartbeat(self, interval):
+        while True:
+            self.beat = time.monotonic()
+            await asyncio.sleep(interval)
+
+    def watch(self, loop_thread, stop, sample):
+        stall = None
+        interval = self.sample_interval if sample else self.threshold / 4
+        while not stop.wait(interval):
+            frame = sys._current_frames().get(loop_thread)
+            if frame is None:
+                continue
+            if sample:
+                self.samples[collapse_stack(frame)] += 1
+
+            if stall is not None and stall["beat"] != self.beat:
+                logging.warning(f"Event loop blocked for {stall['duration']:.2f}s: {stall['where']}")
+                stall = None
+            blocked = time.monotonic() - self.beat
+            if blocked > self.threshold:
+                if stall is None:
+                    stall = {"beat": self.beat, "where": blocking_coroutine(frame), "stack": traceback.format_stack(frame)}
+                    self.stalls.append(stall)
+                stall["duration"] = blocked
+        if stall is not None:
+            logging.warning(f"Event loop blocked for {stall['duration']:.2f}s: {stall['where']}")
+
+    def write_report(self, mode, started, seconds, profile):
+        os.makedirs(self.output_dir, exist_ok=True)
+        base = os.path.join(self.output_dir, f"profile_{datetime.fromtimestamp(started).strftime('%Y%m%d%H%M%S')}")
+        paths = [base + ".txt"]
+
+        lines = [f"Event loop profile ({mode}) for {seconds}s from {datetime.fromtimestamp(started)}", ""]
+        lines.append(f"{len(self.stalls)} stalls longer than {self.threshold * 1000:.0f} ms:")
+        for stall in sorted(self.stalls, key=lambda stall: stall["duration"], reverse=True):
+            lines.append(f"\n{stall['duration']:.3f}s  {stall['where']}")
+            lines.extend("    " + line.rstrip("\n").replace("\n", "\n    ") for line in stall["stack"])
+        lines.append("")
+
+        if profile:
+            stream = io.StringIO()
+            pstats.Stats(profile, stream=stream).sort_stats("cumulative").print_stats(60)
+            lines.append(stream.getvalue())
+            profile.dump_stats(base + ".prof")
+            paths.append(base + ".prof")
+        else:
+            total = sum(self.samples.values())
+            lines.append(f"{total} stack samples every {self.sample_interval * 1000:g} ms, most frequent first:")
+            for stack, count in self.samples.most_common(30):
+                lines.append(f"\n{count / total:6.1%}  {stack.replace(';', ' -> ')}")
+            with open(base + ".stacks.txt", "w", encoding="utf-8") as stacks_file:
+                stacks_file.writelines(f"{stack} {count}\n" for stack, count in self.samples.items())
+            paths.append(base + ".stacks.txt")
+
+        with open(base + ".txt", "w", encoding="utf-8") as summary_file:
+            summary_file.write("\n".join(lines))
+        return paths
+
 
 def validate_email(email):
     pattern = r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$"
     return re.match(pattern, email) is not None
 
 
-def prepare_data_for_csv(results):
-    prepared_data = []
-    for result in results:
-        row = {key: value for key, value in result.items() if key != 'source'}
-        source_info = result.get('source', {})
-        source_name = source_info.get('name', 'Unknown source')
-        source_date = source_info.get('date', 'No date provided')
-        row['source'] = f"Name: {source_name}, Date: {source_date}"
-        prepared_data.append(row)
-    return prepared_data
-
-
-def create_csv_file(data, filename_prefix="results"):
-    if not data:  
+def normalize_search_key(search_type, term):
+    term = term.strip()
+    if search_type in ("email", "domain"):
+        term = term.casefold()
+    return search_type, term
+
+
+def search_handle(key):
+    # Short, stable id for a normalized search, used in persistent button custom_ids.
+    return hashlib.sha1(f"{key[0]}\x1f{key[1]}".encode('utf-8')).hexdigest()[:16]
+
+
+BREACH_FIELDS = ("email", "password", "username", "full_name", "ip_address", "phone_number", "hash")
+BREACH_COLUMNS = BREACH_FIELDS + ("source_name", "source_date")
+
+
+def intern_value(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def clean_field(value):
+    # Breach fields are text. Numbers are kept as text; empty values and anything else
+    # (objects, lists, booleans) are dropped.
+    if type(value) is str:
+        return value or None
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    return None
+
+
+class BreachRecord:
+    """A read-only view of one row of a BreachResults."""
+
+    __slots__ = ("columns", "index")
+
+    def __init__(self, columns, index):
+        self.columns = columns
+        self.index = index
+
+    def get(self, field, default=None):
+        value = self.columns[field][self.index]
+        return default if value is None else value
+
+
+class BreachResults:
+    """Compact, column-oriented breach results.
+
+    Each field is kept in its own list and source names and dates are interned, so large searches
+    cost a few pointers per row instead of a dict per row. Slicing and reversed() return views that
+    share the columns of the container they came from.
+    """
+
+    __slots__ = ("columns", "rows")
+
+    def __init__(self, columns=None, rows=None):
+        self.columns = columns if columns is not None else {column: [] for column in BREACH_COLUMNS}
+        self.rows = rows  # a range over the columns for views, None for the container that owns them
+
+    @classmethod
+    def from_dicts(cls, results):
+        breaches = cls()
+        breaches.extend(results)
+        return breaches
+
+    def extend(self, results):
+        if self.rows is not None:
+            raise TypeError("Can't extend a view of breach results")
+        columns = self.columns
+        if isinstance(results, BreachResults):
+            for column in BREACH_COLUMNS:
+                values = results.columns[column]
+                columns[column].extend(values if results.rows is None else [values[i] for i in results.rows])
+            return
+
+        results = [result for result in results if isinstance(result, dict)]
+        for field in BREACH_FIELDS:
+            columns[field].extend([clean_field(result.get(field)) for result in results])
+        sources = [source if isinstance(source, dict) else {} for source in (result.get("source") for result in results)]
+        columns["source_name"].extend([intern_value(clean_field(source.get("name"))) for source in sources])
+        columns["source_date"].extend([intern_value(clean_field(source.get("date"))) for source in sources])
+
+    def extend_records(self, records):
+        """Appends decoded API records that carry each field as an attribute."""
+        if self.rows is not None:
+            raise TypeError("Can't extend a view of breach results")
+        columns = self.columns
+        for field in BREACH_FIELDS:
+            columns[field].extend([clean_field(getattr(record, field)) for record in records])
+        sources = [record.source if isinstance(record.source, dict) else {} for record in records]
+        columns["source_name"].extend([intern_value(clean_field(source.get("name"))) for source in sources])
+        columns["source_date"].extend([intern_value(clean_field(source.get("date"))) for source in sources])
+
+    def row_indices(self):
+        return range(len(self.columns["email"])) if self.rows is None else self.rows
+
+    def __len__(self):
+        return len(self.row_indices())
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def __iter__(self):
+        columns = self.columns
+        for index in self.row_indices():
+            yield BreachRecord(columns, index)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return BreachResults(self.columns, self.row_indices()[item])
+        return BreachRecord(self.columns, self.row_indices()[item])
+
+    def reversed(self):
+        return BreachResults(self.columns, self.row_indices()[::-1])
+
+    def compact(self):
+        """Returns a self-contained copy holding only the rows of this view, e.g. to send to another process."""
+        if self.rows is None:
+            return self
+        breaches = BreachResults()
+        breaches.extend(self)
+        return breaches
+
+    def to_columns(self):
+        return self.compact().columns
+
+    @classmethod
+    def from_columns(cls, columns):
+        for column in ("source_name", "source_date"):
+            columns[column] = [intern_value(value) for value in columns[column]]
+        return cls(columns)
+
+    def estimate_size(self):
+        size = 0
+        for column in BREACH_COLUMNS:
+            values = self.columns[column]
+            size += 8 * len(self)
+            if column in BREACH_FIELDS:
+                size += sum(len(values[i]) for i in self.row_indices() if isinstance(values[i], str))
+        return size
+
+    def record_hashes(self):
+        """Stable digest of every row's fields, in row order, for telling new breaches from ones seen before."""
+        columns = [self.columns[column] for column in BREACH_COLUMNS]
+        return [
+            hashlib.sha1("\x1f".join(column[index] or "" for column in columns).encode("utf-8")).hexdigest()[:20]
+            for index in self.row_indices()
+        ]
+
+
+class JsonPageDecoder:
+    """Decodes HackCheck API responses with orjson when it is installed, or the standard library.
+
+    decode_page() checks the page's shape and returns {"results": BreachResults, "pagination": dict},
+    raising ValueError for anything that isn't a page of results. decode() is for error bodies.
+    """
+
+    def __init__(self, use_orjson=True):
+        self.name = "orjson" if use_orjson and orjson else "json"
+        self.decode = orjson.loads if self.name == "orjson" else json.loads
+
+    def decode_page(self, body):
+        data = self.decode(body)
+        if not isinstance(data, dict):
+            raise ValueError("expected a JSON object")
+        results = data.get("results") or []
+        if not isinstance(results, list):
+            raise ValueError("results is not a list")
+        pagination = data.get("pagination")
+        return {"results": BreachResults.from_dicts(results), "pagination": pagination if isinstance(pagination, dict) else {}}
+
+
+if msgspec:
+    # Only the fields the bot uses are declared; msgspec skips everything else while decoding.
+    class ApiBreach(msgspec.Struct):
+        email: typing.Any = None
+        password: typing.Any = None
+        username: typing.Any = None
+        full_name: typing.Any = None
+        ip_address: typing.Any = None
+        phone_number: typing.Any = None
+        hash: typing.Any = None
+        source: typing.Any = None
+
+    class ApiPage(msgspec.Struct):
+        results: typing.Optional[typing.List[ApiBreach]] = None
+        pagination: typing.Optional[dict] = None
+
+
+class MsgspecPageDecoder(JsonPageDecoder):
+    """Decodes pages straight into typed records, validating the shape as it goes."""
+
+    def __init__(self):
+        self.name = "msgspec"
+        self.decode = msgspec.json.decode
+        self.page_decoder = msgspec.json.Decoder(ApiPage)
+
+    def decode_page(self, body):
+        page = self.page_decoder.decode(body)
+        results = BreachResults()
+        results.extend_records(page.results or ())
+        return {"results": results, "pagination": page.pagination or {}}
+
+
+def make_page_decoder(name="auto"):
+    """Picks the fastest installed decoder: msgspec, then orjson, then the standard library."""
+    if name in ("auto", "msgspec") and msgspec:
+        return MsgspecPageDecoder()
+    if (name == "msgspec" and not msgspec) or (name == "orjson" and not orjson):
+        logging.warning(f"{name} is not installed, falling back to the next available JSON decoder")
+    return JsonPageDecoder(use_orjson=name != "json")
+
+
+page_decoder = make_page_decoder(config.get("json_decoder", "auto"))
+
+
+# Breach columns that can be indexed, by the search type that looks them up.
+# Searches whose complete results contain every breach for a lookup: a domain crawl returns
+# every breached address at that domain.
+COVERING_SEARCHES = {
+    "email": lambda email: [("domain", email.rpartition("@")[2])],
+}
+
+# Column indexed for each search type in COVERING_SEARCHES. Indexing any other column would cost
+# memory on every cached crawl without ever answering a lookup.
+INDEX_COLUMNS = {
+    "email": "email",
+}
+
+
+class ResultIndex:
+    """Secondary index from breach field values to the rows of complete, cached searches.
+
+    A lookup is answered locally when a search covering it (see COVERING_SEARCHES) completed less
+    than max_age seconds ago; otherwise it goes upstream as usual.
+    """
+
+    def __init__(self, fields=tuple(INDEX_COLUMNS), max_age=3600):
+        self.columns = [INDEX_COLUMNS[field] for field in fields if field in INDEX_COLUMNS]
+        self.max_age = max_age
+        self.postings = {column: {} for column in self.columns}
+        self.sources = {}
+
+    @staticmethod
+    def index_value(column, value):
+        return value.casefold() if column == "email" else value
+
+    def add(self, key, results, fetched_at=None):
+        """Indexes the rows of key. Returns a rough estimate of the bytes the new postings take."""
+        if key in self.sources:
+            self.remove(key)
+        self.sources[key] = (results, fetched_at or time.time())
+        size = 0
+        for column in self.columns:
+            postings = self.postings[column]
+            values = results.columns[column]
+            for index in results.row_indices():
+                value = values[index]
+                if value:
+                    value = self.index_value(column, value)
+                    rows = postings.get(value)
+                    if rows is None:
+                        rows = postings[value] = []
+                        size += 120 + len(value)  # dict slot, key string and posting list
+                    rows.append((key, index))
+                    size += 72  # the (key, row) tuple and its list slot
+        return size
+
+    def remove(self, key):
+        source = self.sources.pop(key, None)
+        if source is None:
+            return
+        results = source[0]
+        for column in self.columns:
+            postings = self.postings[column]
+            values = results.columns[column]
+            for value in {self.index_value(column, values[index]) for index in results.row_indices() if values[index]}:
+                remaining = [posting for posting in postings.get(value, ()) if posting[0] != key]
+                if remaining:
+                    postings[value] = remaining
+                else:
+                    postings.pop(value, None)
+
+    def lookup(self, search_type, term):
+        """Returns (results, covering key, fetched_at) when a fresh covering search holds the answer, else None."""
+        column = INDEX_COLUMNS.get(search_type)
+        covering = COVERING_SEARCHES.get(search_type)
+        if column not in self.postings or covering is None:
+            return None
+
+        value = self.index_value(column, normalize_search_key(search_type, term)[1])
+        for covering_key in covering(value):
+            source = self.sources.get(covering_key)
+            if source is None:
+                continue
+            results, fetched_at = source
+            if time.time() - fetched_at > self.max_age:
+                continue
+            rows = [index for key, index in self.postings[column].get(value, ()) if key == covering_key]
+            return BreachResults(results.columns, rows).compact(), covering_key, fetched_at
         return None
 
-    timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-    filename = f"{filename_prefix}_{timestamp}.csv"
+    def stats(self):
+        return {"searches": len(self.sources), "values": sum(len(postings) for postings in self.postings.values())}
+
+
+class ResultCache:
+    """In-memory TTL + LRU cache of complete search results keyed by normalized (search_type, term)."""
+
+    def __init__(self, ttl=900, max_entries=256, max_bytes=64 * 1024 * 1024, index=None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.index = index
+        self.entries = OrderedDict()
+        self.handles = {}
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, size, results, _ = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return results
+
+    def peek(self, key):
+        """Like get(), but without counting a hit or miss or refreshing the entry's LRU position."""
+        entry = self.entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        return entry[2]
+
+    def is_complete(self, key):
+        """Whether the cached results of key came from a finished, untruncated crawl."""
+        entry = self.entries.get(key)
+        return entry is not None and entry[3]
+
+    def put(self, key, results, complete=False):
+        """Caches results; complete marks a finished, untruncated crawl that the index may answer from."""
+        size = results.estimate_size()
+        if size > self.max_bytes:
+            logging.info(f"Not caching {key[0]} search: {size} bytes exceeds the cache budget")
+            return
 
-    keys = data[0].keys()
-    with open(filename, 'w', newline='', encoding='utf-8') as output_file:
-        dict_writer = csv.DictWriter(output_file, keys)
-        dict_writer.writeheader()
-        dict_writer.writerows(data)
+        if key in self.entries:
+            self._remove(key)
+
+        if complete and self.index:
+            # The index postings count against the budget too, and are released with the entry.
+            size += self.index.add(key, results)
+        self.entries[key] = (time.monotonic() + self.ttl, size, results, complete)
+        self.handles[search_handle(key)] = key
+        self.total_bytes += size
+
+        while len(self.entries) > self.max_entries or self.total_bytes > self.max_bytes:
+            oldest = next(iter(self.entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def _remove(self, key):
+        _, size, _, _ = self.entries.pop(key)
+        self.handles.pop(search_handle(key), None)
+        self.total_bytes -= size
+        if self.index:
+            self.index.remove(key)
+
+    def get_by_handle(self, handle):
+        key = self.handles.get(handle)
+        if key is None:
+            return None
+        results = self.get(key)
+        return None if results is None else (key, results)
+
+    def stats(self):
+        return {
+            "entries": len(self.entries),
+            "bytes": self.total_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
 
-    return filename
 
+def pack_results(results):
+    return zlib.compress(json.dumps(results.to_columns(), separators=(',', ':')).encode('utf-8'), 6)
+
+
+def unpack_results(payload):
+    return BreachResults.from_columns(json.loads(zlib.decompress(payload)))
+
+
+class PersistentResultCache:
+    """SQLite-backed result cache that survives restarts. All database work runs on a single
+    worker thread so lookups never block the event loop.
+
+    The file can be shared by several worker processes, which then answer from each other's searches.
+    """
+
+    def __init__(self, path, ttl=86400, compact_interval=3600):
+        # A compact_interval of None leaves compaction to another process sharing the file.
+        self.path = path
+        self.ttl = ttl
+        self.compact_interval = compact_interval
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="result-store")
+        self.conn = None
+        self.compact_task = None
+
+    async def _run(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+
+    async def start(self):
+        await self._run(self._open)
+        if self.compact_interval:
+            self.compact_task = asyncio.create_task(self._compact_loop())
+        logging.info(f"Persistent result cache opened at {self.path}")
+
+    async def close(self):
+        if self.compact_task:
+            self.compact_task.cancel()
+        if self.conn:
+            await self._run(self.conn.close)
+            self.conn = None
+        self.executor.shutdown(wait=False)
+
+    def _open(self):
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "search_type TEXT NOT NULL, term TEXT NOT NULL, created_at REAL NOT NULL, "
+            "expires_at REAL NOT NULL, payload BLOB NOT NULL, handle TEXT, PRIMARY KEY (search_type, term))"
+        )
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(results)")]
+        if "handle" not in columns:
+            # Caches written before handles existed. Another process may add the column first.
+            try:
+                self.conn.execute("ALTER TABLE results ADD COLUMN handle TEXT")
+            except sqlite3.OperationalError as e:
+                if "duplicate column" not in str(e):
+                    raise
+        self.conn.execute("CREATE INDEX IF NOT EXISTS results_expires_at ON results (expires_at)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS results_handle ON results (handle)")
+        self.conn.commit()
+
+    def _get(self, key):
+        row = self.conn.execute(
+            "SELECT payload FROM results WHERE search_type = ? AND term = ? AND expires_at > ?",
+            (key[0], key[1], time.time()),
+        ).fetchone()
+        if row is None:
+            return None
+        return unpack_results(row[0])
+
+    def _get_by_handle(self, handle):
+        row = self.conn.execute(
+            "SELECT search_type, term, payload FROM results WHERE handle = ? AND expires_at > ?",
+            (handle, time.time()),
+        ).fetchone()
+        if row is None:
+            return None
+        return (row[0], row[1]), unpack_results(row[2])
+
+    def _put(self, key, results, ttl):
+        now = time.time()
+        payload = pack_results(results)
+        self.conn.execute(
+            "INSERT OR REPLACE INTO results (search_type, term, handle, created_at, expires_at, payload) VALUES (?, ?, ?, ?, ?, ?)",
+            (key[0], key[1], search_handle(key), now, now + ttl, payload),
+        )
+        self.conn.commit()
+
+    def _compact(self):
+        deleted = self.conn.execute("DELETE FROM results WHERE expires_at <= ?", (time.time(),)).rowcount
+        self.conn.commit()
+        if deleted:
+            self.conn.execute("VACUUM")
+        return deleted
+
+    async def get(self, key):
+        try:
+            return await self._run(self._get, key)
+        except Exception as e:
+            logging.error(f"Error reading persistent result cache: {e}")
+            return None
 
-def create_pdf_from_csv(csv_filename, filename_prefix="results"):
-    timestamp = csv_filename.split('_')[-1].split('.')[0]
-    pdf_filename = f"{filename_prefix}_{timestamp}.pdf"
+    async def get_by_handle(self, handle):
+        try:
+            return await self._run(self._get_by_handle, handle)
+        except Exception as e:
+            logging.error(f"Error reading persistent result cache: {e}")
+            return None
 
-    with open(csv_filename, newline='', encoding='utf-8') as csvfile:
-        reader = csv.reader(csvfile)
-        data = [list(row) for row in reader]
+    async def put(self, key, results, ttl=None):
+        try:
+            await self._run(self._put, key, results, ttl or self.ttl)
+        except Exception as e:
+            logging.error(f"Error writing persistent result cache: {e}")
 
-    readable_style = ParagraphStyle(
-        name='Readable',
-        fontName='Times-Roman',  
-        fontSize=10,
-        leading=12,  
-        alignment=TA_LEFT,
-    )
+    async def _compact_loop(self):
+        while True:
+            await asyncio.sleep(self.compact_interval)
+            try:
+                deleted = await self._run(self._compact)
+                if deleted:
+                    logging.info(f"Compacted persistent result cache, removed {deleted} expired searches")
+            except Exception as e:
+                logging.error(f"Error compacting persistent result cache: {e}")
 
-    styles = getSampleStyleSheet()
-    styleNormal = styles['Normal']
-    styleNormal.wordWrap = 'CJK'  
 
-    for i, row in enumerate(data):
-        for j, cell in enumerate(row):
-            if j == len(row) - 1:
-                try:
-                    source_dict = ast.literal_eval(cell)
-                    source_str = f"{source_dict.get('name', 'N/A')}: {source_dict.get('date', 'No date')}"
-                    data[i][j] = Paragraph(escape(source_str), readable_style)
-                except (ValueError, SyntaxError):
-                    data[i][j] = Paragraph(escape(cell), readable_style)
-            else:
-                data[i][j] = Paragraph(escape(cell), readable_style)
+class RedisResultCache:
+    """Result cache shared through a Redis-compatible server, for workers that don't share a disk.
+
+    Same interface as PersistentResultCache. Each search is one key named after its handle, and
+    Redis expires it at the TTL.
+    """
+
+    def __init__(self, url, ttl=86400, prefix="hackcheck:result:"):
+        self.url = url
+        self.ttl = ttl
+        self.prefix = prefix
+        self.client = None
+
+    async def start(self):
+        self.client = aioredis.from_url(self.url)
+        await self.client.ping()
+        logging.info("Shared result cache connected to Redis")
+
+    async def close(self):
+        if self.client:
+            await self.client.aclose()
+            self.client = None
+
+    async def get(self, key):
+        found = await self.get_by_handle(search_handle(key))
+        if found is None or found[0] != key:
+            return None
+        return found[1]
+
+    async def get_by_handle(self, handle):
+        try:
+            payload = await self.client.get(self.prefix + handle)
+            if payload is None:
+                return None
+            key_length = int.from_bytes(payload[:2], "big")
+            search_type, term = payload[2:2 + key_length].decode("utf-8").split("\x1f", 1)
+            return (search_type, term), unpack_results(payload[2 + key_length:])
+        except Exception as e:
+            logging.error(f"Error reading shared result cache: {e}")
+            return None
+
+    async def put(self, key, results, ttl=None):
+        try:
+            # The search key goes in front of the results so a handle alone can find both.
+            encoded_key = f"{key[0]}\x1f{key[1]}".encode("utf-8")
+            payload = len(encoded_key).to_bytes(2, "big") + encoded_key + pack_results(results)
+            await self.client.set(self.prefix + search_handle(key), payload, ex=int(ttl or self.ttl))
+        except Exception as e:
+            logging.error(f"Error writing shared result cache: {e}")
+
+
+def next_watch_run(key, after, interval_days=1, off_peak_hours=(2, 6)):
+    """When a watched search next runs: interval_days after its last slot, inside the off-peak window (UTC hours).
+
+    Each search gets a fixed offset into the window from its handle, so a long watchlist is spread
+    over the whole window instead of hitting the API all at once.
+    """
+    start_hour, end_hour = off_peak_hours
+    window = ((end_hour - start_hour) % 24 or 24) * 3600
+    slot = start_hour * 3600 + int(search_handle(key), 16) % window
+    day = math.floor((after - slot) / 86400) + interval_days
+    return day * 86400 + slot
+
+
+class WatchlistStore:
+    """SQLite store of watched searches and the hashes of the results already reported for each.
+
+    Like PersistentResultCache, all database work runs on a single worker thread.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="watchlist")
+        self.conn = None
+
+    async def _run(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+
+    async def start(self):
+        await self._run(self._open)
+        logging.info(f"Watchlist opened at {self.path}")
+
+    async def close(self):
+        if self.conn:
+            await self._run(self.conn.close)
+            self.conn = None
+        self.executor.shutdown(wait=False)
+
+    def _open(self):
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS watches ("
+            "id INTEGER PRIMARY KEY, search_type TEXT NOT NULL, term TEXT NOT NULL, guild_id INTEGER, "
+            "channel_id INTEGER NOT NULL, user_id INTEGER, created_at REAL NOT NULL, next_run REAL NOT NULL, "
+            "last_run REAL, last_status TEXT, UNIQUE (search_type, term, channel_id))"
+        )
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS watch_records ("
+            "watch_id INTEGER NOT NULL, record_hash TEXT NOT NULL, PRIMARY KEY (watch_id, record_hash)) WITHOUT ROWID"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS watches_next_run ON watches (next_run)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS watches_guild_id ON watches (guild_id)")
+        self.conn.commit()
+
+    def _add(self, key, guild_id, channel_id, user_id):
+        now = time.time()
+        cursor = self.conn.execute(
+            "INSERT OR IGNORE INTO watches (search_type, term, guild_id, channel_id, user_id, created_at, next_run) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (key[0], key[1], guild_id, channel_id, user_id, now, now),
+        )
+        self.conn.commit()
+        return cursor.lastrowid if cursor.rowcount else None
+
+    def _remove(self, watch_id, guild_id):
+        deleted = self.conn.execute("DELETE FROM watches WHERE id = ? AND guild_id = ?", (watch_id, guild_id)).rowcount
+        if deleted:
+            self.conn.execute("DELETE FROM watch_records WHERE watch_id = ?", (watch_id,))
+        self.conn.commit()
+        return bool(deleted)
+
+    def _list(self, guild_id):
+        return [dict(row) for row in self.conn.execute("SELECT * FROM watches WHERE guild_id = ? ORDER BY id", (guild_id,))]
+
+    def _due(self, now, limit):
+        return [dict(row) for row in self.conn.execute("SELECT * FROM watches WHERE next_run <= ? ORDER BY next_run LIMIT ?", (now, limit))]
+
+    def _seen(self, watch_id):
+        return {row[0] for row in self.conn.execute("SELECT record_hash FROM watch_records WHERE watch_id = ?", (watch_id,))}
+
+    def _finish_run(self, watch_id, hashes, ran_at, next_run, status):
+        # Both in one transaction, so a crash can't record hashes without moving the schedule on.
+        self.conn.executemany("INSERT OR IGNORE INTO watch_records (watch_id, record_hash) VALUES (?, ?)", ((watch_id, h) for h in hashes))
+        self.conn.execute("UPDATE watches SET last_run = ?, next_run = ?, last_status = ? WHERE id = ?", (ran_at, next_run, status, watch_id))
+        self.conn.commit()
+
+    def _reschedule(self, watch_id, next_run, status):
+        self.conn.execute("UPDATE watches SET next_run = ?, last_status = ? WHERE id = ?", (next_run, status, watch_id))
+        self.conn.commit()
+
+    async def add(self, key, guild_id, channel_id, user_id):
+        """Adds a watch due to run straight away; returns its id, or None if the channel already watches that search."""
+        return await self._run(self._add, key, guild_id, channel_id, user_id)
+
+    async def remove(self, watch_id, guild_id):
+        return await self._run(self._remove, watch_id, guild_id)
+
+    async def list(self, guild_id):
+        return await self._run(self._list, guild_id)
+
+    async def due(self, now, limit=50):
+        return await self._run(self._due, now, limit)
+
+    async def seen(self, watch_id):
+        return await self._run(self._seen, watch_id)
+
+    async def finish_run(self, watch_id, hashes, ran_at, next_run, status):
+        await self._run(self._finish_run, watch_id, hashes, ran_at, next_run, status)
+
+    async def reschedule(self, watch_id, next_run, status):
+        await self._run(self._reschedule, watch_id, next_run, status)
+
+
+REPORT_FIELDS = ("email", "password", "full_name", "username", "ip_address", "phone_number", "hash")
+REPORT_HEADER = REPORT_FIELDS + ("source",)
 
-    pdf = SimpleDocTemplate(pdf_filename, pagesize=landscape(elevenSeventeen))
 
-    usable_width = landscape(elevenSeventeen)[0] - 2 * 72  # 1 inch margins on each side
-    column_widths = [usable_width * 0.19,  # email
+def prepare_data_for_csv(results):
+    # Yields one report row per breach, in REPORT_HEADER order.
+    columns = [results.columns[field] for field in REPORT_FIELDS]
+    source_names = results.columns["source_name"]
+    source_dates = results.columns["source_date"]
+    for index in results.row_indices():
+        row = [column[index] or '' for column in columns]
+        source_name = source_names[index] or 'Unknown source'
+        source_date = source_dates[index] or 'No date provided'
+        row.append(f"Name: {source_name}, Date: {source_date}")
+        yield row
+
+
+def create_csv_report(results):
+    buffer = io.BytesIO()
+    text = io.TextIOWrapper(buffer, encoding='utf-8', newline='')
+    writer = csv.writer(text)
+    writer.writerow(REPORT_HEADER)
+    writer.writerows(prepare_data_for_csv(results))
+    text.flush()
+    text.detach()
+    return buffer.getvalue()
+
+
+PDF_PAGE_SIZE = landscape(elevenSeventeen)
+PDF_FONT_SIZE = 10
+PDF_CHUNK_ROWS = 40  # about one page of single-line rows
+PDF_PARAGRAPH_CHARS = 200
+
+pdf_cell_style = ParagraphStyle(
+    name='Readable',
+    fontName='Times-Roman',
+    fontSize=PDF_FONT_SIZE,
+    leading=12,
+    alignment=TA_LEFT,
+)
+
+pdf_table_style = TableStyle([
+    ('BACKGROUND', (0,0), (-1,0), colors.grey),
+    ('TEXTCOLOR', (0,0), (-1,0), colors.whitesmoke),
+    ('ALIGN', (0,0), (-1,-1), 'LEFT'),
+    ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
+    ('FONTNAME', (0,1), (-1,-1), 'Times-Roman'),
+    ('FONTSIZE', (0,0), (-1,-1), PDF_FONT_SIZE),
+    ('LEADING', (0,0), (-1,-1), 12),
+    ('BOTTOMPADDING', (0,0), (-1,0), 12),
+    ('BACKGROUND', (0,1), (-1,-1), colors.beige),
+    ('GRID', (0,0), (-1,-1), 1, colors.black),
+    ('VALIGN', (0,0), (-1,-1), 'TOP'),
+    ('LEFTPADDING', (0,0), (-1,-1), 3),
+    ('RIGHTPADDING', (0,0), (-1,-1), 3),
+])
+
+
+usable_width = PDF_PAGE_SIZE[0] - 2 * 72  # 1 inch margins on each side
+PDF_COLUMN_WIDTHS = [usable_width * 0.19,  # email
                      usable_width * 0.10,  # password
                      usable_width * 0.10,  # full_name
                      usable_width * 0.10,  # username
@@ -154,64 +1263,429 @@ def create_pdf_from_csv(csv_filename, filename_prefix="results"):
                      usable_width * 0.08,  # phone_number
                      usable_width * 0.20,  # hash (remaining space)
                      usable_width * 0.15]  # source
+PDF_TEXT_WIDTHS = [width - 6 for width in PDF_COLUMN_WIDTHS]  # minus left and right padding
+
+
+def pdf_cell(value, width):
+    # Cells are drawn as plain (pre-wrapped) strings, which is far cheaper for ReportLab to lay out
+    # than a Paragraph. Only long text still gets a Paragraph, for proper word wrapping.
+    text = str(value) if value else ''
+    if len(text) > PDF_PARAGRAPH_CHARS:
+        return Paragraph(escape(text), pdf_cell_style)
+    if '\n' not in text and stringWidth(text, 'Times-Roman', PDF_FONT_SIZE) <= width:
+        return text
+
+    lines = []
+    for line in simpleSplit(text, 'Times-Roman', PDF_FONT_SIZE, width):
+        # simpleSplit only breaks on spaces, so cut words that are still too wide (hashes, tokens).
+        while stringWidth(line, 'Times-Roman', PDF_FONT_SIZE) > width and len(line) > 1:
+            cut = max(1, int(len(line) * width / stringWidth(line, 'Times-Roman', PDF_FONT_SIZE)))
+            lines.append(line[:cut])
+            line = line[cut:]
+        lines.append(line)
+    return '\n'.join(lines)
+
+
+class PdfTableChunk(Flowable):
+    """A slice of breach results whose Table (and Paragraphs) are only built when the chunk is laid
+    out, so at most one chunk's worth of cells is alive at a time."""
+
+    def __init__(self, results):
+        super().__init__()
+        self.results = results
+        self.table = None
 
-    table = Table(data, colWidths=column_widths, repeatRows=1)
-
-    style = TableStyle([
-        ('BACKGROUND', (0,0), (-1,0), colors.grey),
-        ('TEXTCOLOR', (0,0), (-1,0), colors.whitesmoke),
-        ('ALIGN', (0,0), (-1,-1), 'LEFT'),
-        ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
-        ('BOTTOMPADDING', (0,0), (-1,0), 12),
-        ('BACKGROUND', (0,1), (-1,-1), colors.beige),
-        ('GRID', (0,0), (-1,-1), 1, colors.black),
-        ('VALIGN', (0,0), (-1,-1), 'TOP'),
-        ('LEFTPADDING', (0,0), (-1,-1), 3),
-        ('RIGHTPADDING', (0,0), (-1,-1), 3),
-    ])
-    table.setStyle(style)
+    def build_table(self):
+        if self.table is None:
+            data = [list(REPORT_HEADER)]
+            for row in prepare_data_for_csv(self.results):
+                data.append([pdf_cell(value, width) for value, width in zip(row, PDF_TEXT_WIDTHS)])
+            self.table = Table(data, colWidths=PDF_COLUMN_WIDTHS, repeatRows=1)
+            self.table.setStyle(pdf_table_style)
+        return self.table
+
+    def wrap(self, availWidth, availHeight):
+        return self.build_table().wrap(availWidth, availHeight)
+
+    def split(self, availWidth, availHeight):
+        return self.build_table().split(availWidth, availHeight)
 
-    elems = [table]
+    def drawOn(self, canvas, x, y, _sW=0):
+        self.build_table().drawOn(canvas, x, y, _sW)
+
+
+def create_pdf_report(results, chunk_rows=PDF_CHUNK_ROWS):
+    elems = [PdfTableChunk(results[start:start + chunk_rows]) for start in range(0, len(results), chunk_rows)]
+
+    buffer = io.BytesIO()
+    pdf = SimpleDocTemplate(buffer, pagesize=PDF_PAGE_SIZE, pageCompression=1)
     pdf.build(elems)
 
-    return pdf_filename
+    return buffer.getvalue()
 
 
-class PaginatorView(discord.ui.View):
-    def __init__(self, data, term, search_type, page_size=4):
-        super().__init__()
+# Compressed PDFs come out at about the size of the CSV. A part that still ends up too big is split again.
+PDF_SIZE_RATIO = 1.0
+MAX_REPORT_PARTS = 10
+
+
+def split_rows(results, parts):
+    size = math.ceil(len(results) / parts)
+    return [results[start:start + size] for start in range(0, len(results), size)]
+
+
+def gzip_report(data, name):
+    return gzip.compress(data, 9)
+
+
+def zip_report(data, name):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=9) as archive:
+        archive.writestr(name, data)
+    return buffer.getvalue()
+
+
+def fit_csv_report(results, size_limit, create=create_csv_report, name="full_results"):
+    data = create(results)
+    if size_limit is None or len(data) <= size_limit:
+        return [(".csv", data)], len(data)
+
+    compressed = [(".csv.gz", gzip_report), (".zip", zip_report)]
+    candidates = [(suffix, compress(data, f"{name}.csv"), compress) for suffix, compress in compressed]
+    suffix, smallest, compress = min(candidates, key=lambda candidate: len(candidate[1]))
+    if len(smallest) <= size_limit:
+        return [(suffix, smallest)], len(data)
+
+    # Even compressed it is too big: split the rows into parts sized from the compression ratio.
+    parts = math.ceil(len(smallest) / (size_limit * 0.9))
+    while True:
+        if parts > len(results):
+            return [], len(data)
+        files = []
+        for index, chunk in enumerate(split_rows(results, parts)):
+            part = compress(create(chunk), f"{name}_part{index + 1}.csv")
+            if len(part) > size_limit:
+                break
+            files.append(part)
+        else:
+            return [(f"_part{index + 1}of{len(files)}{suffix}", part) for index, part in enumerate(files)], len(data)
+        parts *= 2
+
+
+def fit_pdf_report(results, size_limit, csv_size):
+    if size_limit is None:
+        return [(".pdf", create_pdf_report(results))]
+
+    # Plan the parts from the CSV size so we don't render PDFs that could never be uploaded.
+    parts = max(1, math.ceil(csv_size * PDF_SIZE_RATIO / (size_limit * 0.9)))
+    if parts > MAX_REPORT_PARTS:
+        logging.info(f"Skipping PDF report, it would need about {parts} parts")
+        return []
+
+    pending = split_rows(results, parts)
+    files = []
+    while pending:
+        chunk = pending.pop(0)
+        data = create_pdf_report(chunk)
+        if len(data) <= size_limit:
+            files.append(data)
+        elif len(chunk) > 1 and len(files) + len(pending) + 2 <= MAX_REPORT_PARTS:
+            pending[:0] = split_rows(chunk, 2)
+        else:
+            logging.info("Skipping PDF report, a part does not fit the upload limit")
+            return []
+
+    if len(files) == 1:
+        return [(".pdf", files[0])]
+    return [(f"_part{index + 1}of{len(files)}.pdf", data) for index, data in enumerate(files)]
+
+
+def render_reports(results, size_limit=None):
+    """Builds the CSV and PDF reports in memory. Returns {"csv": [...], "pdf": [...]} lists of
+    (filename suffix, bytes), compressed and split into parts as needed to fit size_limit."""
+    if not results:
+        return None
+    csv_files, csv_size = fit_csv_report(results, size_limit)
+    return {"csv": csv_files, "pdf": fit_pdf_report(results, size_limit, csv_size)}
+
+
+class BulkResults:
+    """Breach results of several search terms in one container, with the term of each row."""
+
+    def __init__(self, terms=None, results=None):
+        self.terms = terms if terms is not None else []
+        self.results = results if results is not None else BreachResults()
+
+    def add(self, term, results):
+        self.terms.extend([term] * len(results))
+        self.results.extend(results)
+
+    def __len__(self):
+        return len(self.terms)
+
+    def __getitem__(self, item):
+        return BulkResults(self.terms[item], self.results[item])
+
+    def compact(self):
+        return BulkResults(self.terms, self.results.compact())
+
+
+def create_bulk_csv_report(bulk):
+    buffer = io.BytesIO()
+    text = io.TextIOWrapper(buffer, encoding='utf-8', newline='')
+    writer = csv.writer(text)
+    writer.writerow(("term",) + REPORT_HEADER)
+    writer.writerows([term] + row for term, row in zip(bulk.terms, prepare_data_for_csv(bulk.results)))
+    text.flush()
+    text.detach()
+    return buffer.getvalue()
+
+
+def create_bulk_summary(summary):
+    buffer = io.StringIO(newline='')
+    writer = csv.writer(buffer)
+    writer.writerow(("term", "status", "results"))
+    writer.writerows(summary)
+    return buffer.getvalue().encode('utf-8')
+
+
+def render_bulk_report(bulk, summary, size_limit=None):
+    """Builds the per-term summary CSV and one CSV of every term's results, fitted to size_limit."""
+    files, _ = fit_csv_report(bulk, size_limit, create=create_bulk_csv_report, name="bulk_results") if bulk else ([], 0)
+    return {"summary": [(".csv", create_bulk_summary(summary))], "csv": files}
+
+
+def upload_limit(interaction):
+    return guild_upload_limit(interaction.guild)
+
+
+def guild_upload_limit(guild):
+    # Leave headroom for the multipart request around the file.
+    limit = guild.filesize_limit if guild else 10 * 1024 * 1024
+    return int(config.get("upload_limit_bytes", limit) * 0.95)
+
+
+class ReportQueueFull(Exception):
+    pass
+
+
+class ReportRenderer:
+    """Runs report rendering in a bounded process (or thread) pool so large PDFs never block the event loop."""
+
+    def __init__(self, mode="process", workers=2, max_queue=8, job_timeout=300):
+        if mode == "thread":
+            self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="report")
+        else:
+            # Spawned rather than forked, so workers don't inherit the running bot's event loop and sockets.
+            self.executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        self.mode = mode
+        self.max_queue = max_queue
+        self.job_timeout = job_timeout
+        self.jobs = 0
+
+    async def render(self, results, size_limit=None, deadline=None):
+        """Renders the CSV and PDF report bytes, giving up at job_timeout or at the wall-clock deadline, whichever is sooner."""
+        # Views share their parent's columns; send only the rows being reported.
+        return await self.run(render_reports, results.compact(), size_limit, deadline=deadline)
+
+    async def run(self, func, *args, deadline=None):
+        if self.jobs >= self.max_queue:
+            raise ReportQueueFull(f"{self.jobs} report jobs already queued")
+
+        timeout = self.job_timeout
+        if deadline is not None:
+            timeout = min(timeout, deadline - time.time())
+        if timeout <= 0:
+            raise asyncio.TimeoutError("The interaction expired before the report could be rendered")
+
+        loop = asyncio.get_running_loop()
+        self.jobs += 1
+        future = self.executor.submit(func, *args)
+        # A job that started can't be stopped, so it stays counted until it really finishes, not
+        # just until we stop waiting for it.
+        future.add_done_callback(lambda _: loop.call_soon_threadsafe(self.finish_job))
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError:
+            future.cancel()  # drops it if it is still waiting for a worker
+            raise
+
+    def finish_job(self):
+        self.jobs -= 1
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+DISCORD_MESSAGE_LIMIT = 2000
+PAGE_FOOTER_RESERVE = 80  # room for the page number and the "results so far" line
+
+
+class PageLayout:
+    """Splits breach results into pages that each pack as many breaches as fit in one message.
+
+    Page boundaries depend only on the results before them, so finished pages are memoized and
+    turning a page costs one page build at most.
+    """
+
+    def __init__(self, data, term, search_type, complete=True):
         self.data = data
         self.term = term
         self.search_type = search_type
-        self.page_size = page_size
+        self.complete = complete
+        self.page_starts = [0]
+        self.page_cache = {}
+        self.last_used = time.monotonic()
+
+    def build_page(self, start):
+        budget = DISCORD_MESSAGE_LIMIT - len(format_breaches_header(self.term)) - PAGE_FOOTER_RESERVE
+        blocks = []
+        used = 0
+        end = start
+        while end < len(self.data):
+            block = format_breach(self.data[end])
+            needed = len(block) + (2 if blocks else 0)
+            if used + needed > budget:
+                if not blocks:
+                    blocks.append(block[:budget - 1] + "…")
+                    end += 1
+                break
+            blocks.append(block)
+            used += needed
+            end += 1
+        return end, '\n\n'.join(blocks)
+
+    def page(self, number):
+        if number in self.page_cache:
+            return self.page_cache[number]
+
+        end, text = self.build_page(self.page_starts[number])
+        # The last page can still grow while results are streaming in; any other page is final.
+        if end < len(self.data) or self.complete:
+            self.page_cache[number] = (end, text)
+            if end < len(self.data) and len(self.page_starts) == number + 1:
+                self.page_starts.append(end)
+        return end, text
+
+    def seek(self, number):
+        """Lays out pages up to number (e.g. after a reload) and returns it, or the last page if there are fewer."""
+        while len(self.page_starts) <= number:
+            last = len(self.page_starts) - 1
+            end, _ = self.page(last)
+            if end >= len(self.data):
+                return last
+        return number
+
+    def has_next(self, number):
+        end, _ = self.page(number)
+        return end < len(self.data)
+
+    def render(self, number):
+        self.last_used = time.monotonic()
+        if not self.data:
+            content = format_breaches(self.term, self.search_type, {"results": self.data})
+        else:
+            _, text = self.page(number)
+            content = format_breaches_header(self.term) + text + f"\n\nPage {number + 1}"
+        if not self.complete:
+            content += f"\n⏳ {len(self.data)} results so far…"
+        return content
+
+
+class PaginatorButton(discord.ui.DynamicItem[discord.ui.Button], template=r"hackcheck:page:(?P<action>back|next):(?P<handle>[0-9a-f]{16}):(?P<page>\d+)"):
+    """Back/Next button of a finished search. The custom_id carries the search handle and the page
+    on screen, so the button keeps working after a restart and the results are loaded on demand."""
+
+    def __init__(self, action, handle, page, disabled=False):
+        super().__init__(discord.ui.Button(
+            label="Back" if action == "back" else "Next",
+            style=discord.ButtonStyle.primary,
+            custom_id=f"hackcheck:page:{action}:{handle}:{page}",
+            disabled=disabled,
+        ))
+        self.action = action
+        self.handle = handle
+        self.page = page
+
+    @classmethod
+    async def from_custom_id(cls, interaction, item, match):
+        return cls(match["action"], match["handle"], int(match["page"]))
+
+    async def callback(self, interaction: discord.Interaction):
+        try:
+            with metrics.timer("hackcheck_paginator_seconds", view="persistent"):
+                layout = await interaction.client.load_page_layout(self.handle)
+                if layout is None:
+                    await interaction.response.send_message("These results have expired. Please run the search again with /hackcheck.", ephemeral=True)
+                    return
+
+                page = layout.seek(max(self.page - 1, 0) if self.action == "back" else self.page + 1)
+                view = persistent_paginator_view(self.handle, page, layout.has_next(page))
+                await interaction.response.edit_message(content=layout.render(page), view=view)
+        except discord.NotFound:
+            logging.error("Error: Message not found when trying to edit.")
+        except discord.HTTPException as e:
+            logging.error(f"HTTP error occurred: {e}")
+        except Exception as e:
+            logging.error(f"Unhandled exception in persistent paginator: {e}")
+
+
+def persistent_paginator_view(handle, page, has_next):
+    view = discord.ui.View(timeout=None)
+    view.add_item(PaginatorButton("back", handle, page, disabled=page == 0))
+    view.add_item(PaginatorButton("next", handle, page, disabled=not has_next))
+    return view
+
+
+class PaginatorView(discord.ui.View):
+    """Paginator for a search that is still streaming in. Once the search is complete and stored,
+    make_persistent() hands the message over to PaginatorButtons and this view lets go of the data."""
+
+    def __init__(self, data, term, search_type, complete=True, refresh_interval=1.5, timeout=180):
+        # A search can stream for longer than the timeout, so finish() starts it.
+        super().__init__(timeout=None)
+        self.finished_timeout = timeout
+        if not complete:
+            # Batches may be shared with other subscribers of the same search, so grow a copy.
+            results = BreachResults()
+            results.extend(data)
+            data = results
+        self.layout = PageLayout(data, term, search_type, complete)
         self.current_page = 0
-        self.max_page = (len(self.data) - 1) // page_size
         self.message = None
+        self.refresh_interval = refresh_interval
+        self.last_refresh = 0
 
-        self.back_button = discord.ui.Button(label="Back", style=discord.ButtonStyle.primary, disabled=(self.current_page == 0))
-        self.next_button = discord.ui.Button(label="Next", style=discord.ButtonStyle.primary, disabled=(self.current_page >= self.max_page))
+        self.back_button = discord.ui.Button(label="Back", style=discord.ButtonStyle.primary, disabled=True)
+        self.next_button = discord.ui.Button(label="Next", style=discord.ButtonStyle.primary, disabled=True)
         
         self.add_item(self.back_button)
         self.add_item(self.next_button)
         self.back_button.callback = self.back_button_callback
         self.next_button.callback = self.next_button_callback
 
+    @property
+    def data(self):
+        return self.layout.data
+
+    @property
+    def complete(self):
+        return self.layout.complete
+
     async def back_button_callback(self, interaction: discord.Interaction):
         if self.current_page > 0:
             self.current_page -= 1
         await self.update_buttons_and_message(interaction)
 
     async def next_button_callback(self, interaction: discord.Interaction):
-        if self.current_page < self.max_page:
+        if self.layout.has_next(self.current_page):
             self.current_page += 1
         await self.update_buttons_and_message(interaction)
 
     async def update_buttons_and_message(self, interaction):
         try:
-            self.back_button.disabled = self.current_page == 0
-            self.next_button.disabled = self.current_page >= self.max_page
-            await self.update_message(interaction)
-            await interaction.response.edit_message(view=self)
+            with metrics.timer("hackcheck_paginator_seconds", view="live"):
+                await interaction.response.edit_message(content=self.render(), view=self)
         except discord.NotFound:
             logging.error("Error: Message not found when trying to edit.")
         except discord.HTTPException as e:
@@ -219,22 +1693,65 @@ class PaginatorView(discord.ui.View):
         except Exception as e:
             logging.error(f"Unhandled exception: {e}")
 
-    async def update_message(self, interaction):
-        start = self.current_page * self.page_size
-        end = start + self.page_size
-        limited_results = {"results": self.data[start:end]}
-        content = format_breaches(self.term, self.search_type, limited_results)
+    def render(self):
+        # A finished view no longer receives clicks, so its buttons must stay disabled.
+        finished = self.is_finished()
+        self.back_button.disabled = finished or self.current_page == 0
+        self.next_button.disabled = finished or not self.layout.has_next(self.current_page)
+        return self.layout.render(self.current_page)
+
+    async def extend(self, results):
+        """Adds a newly fetched batch and refreshes the message, at most once per refresh interval."""
+        self.layout.data.extend(results)
+        self.next_button.disabled = self.is_finished() or not self.layout.has_next(self.current_page)
+        if self.message and time.monotonic() - self.last_refresh >= self.refresh_interval:
+            await self.refresh()
+
+    async def finish(self, bot=None, handle=None):
+        """Marks the results complete, then hands the message over to persistent buttons when given
+        a handle, or otherwise starts the view's timeout."""
+        self.layout.complete = True
+        if handle is not None and await self.make_persistent(bot, handle):
+            return
+        self.timeout = self.finished_timeout
+        await self.refresh()  # storing the edited view again is what starts its timeout
+
+    async def refresh(self):
+        self.last_refresh = time.monotonic()
         try:
             if self.message:
-                await self.message.edit(content=content, view=self)
-            else:
-                self.message = await interaction.followup.send(content=content, view=self)
+                await self.message.edit(content=self.render(), view=self)
         except discord.NotFound:
-            logging.error("Error: Message not found when trying to send or edit.")
+            logging.error("Error: Message not found when trying to edit.")
         except discord.HTTPException as e:
-            logging.error(f"HTTP error while sending or editing message: {e}")
-        except Exception as e:
-            logging.error(f"Unhandled exception during message update: {e}")
+            logging.error(f"HTTP error while refreshing paginator: {e}")
+
+    async def make_persistent(self, bot, handle):
+        if self.message is None:
+            return False
+        bot.remember_page_layout(handle, self.cached_layout(bot, handle))
+        view = persistent_paginator_view(handle, self.current_page, self.layout.has_next(self.current_page))
+        try:
+            await self.message.edit(content=self.layout.render(self.current_page), view=view)
+        except discord.HTTPException as e:
+            logging.error(f"HTTP error while making paginator persistent: {e}")
+            return False
+        self.stop()
+        self.layout = PageLayout(BreachResults(), self.layout.term, self.layout.search_type)
+        return True
+
+    def cached_layout(self, bot, handle):
+        """The layout to keep for the persistent buttons: on the cached results when they hold the
+        same rows, so the streamed copy can be dropped instead of kept alongside them."""
+        key = bot.result_cache.handles.get(handle)
+        cached = bot.result_cache.peek(key) if key else None
+        if cached is None or cached is self.layout.data or len(cached) != len(self.layout.data):
+            return self.layout
+        layout = PageLayout(cached, self.layout.term, self.layout.search_type)
+        # Same rows in the same order, so the pages already laid out still apply.
+        layout.page_starts = self.layout.page_starts
+        layout.page_cache = self.layout.page_cache
+        return layout
 
     async def on_timeout(self):
         self.back_button.disabled = True
@@ -253,100 +1770,958 @@ class PaginatorView(discord.ui.View):
         self.stop()
 
 
-async def make_hackcheck_request(search_type, term, max_pages=75):
+class TokenBucket:
+    def __init__(self, rate, period):
+        self.capacity = rate
+        self.tokens = rate
+        self.fill_rate = rate / period
+        self.updated = time.monotonic()
+
+    def refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.fill_rate)
+        self.updated = now
+
+    def wait_time(self):
+        self.refill()
+        if self.tokens >= 1:
+            return 0
+        return (1 - self.tokens) / self.fill_rate
+
+    def take(self):
+        self.tokens -= 1
+
+    def is_full(self):
+        self.refill()
+        return self.tokens >= self.capacity
+
+
+class ApiRequester:
+    """Identifies one search to the ApiScheduler, along with who it is being run for."""
+
+    def __init__(self, user_id=None, guild_id=None, per_minute=None):
+        self.user_id = user_id
+        self.guild_id = guild_id
+        self.per_minute = per_minute  # overrides the scheduler's per-user budget, e.g. for background work
+
+
+class ApiScheduler:
+    """Hands out HackCheck API request slots within the configured quota.
+
+    Waiting searches are served round-robin, one page each, so a long crawl can't starve new
+    searches, and every user and guild also has its own per-minute budget. A 429 pauses all
+    requests for the Retry-After period since the quota is shared by the whole API key.
+
+    When worker processes share the API key, a shared limiter (SqliteRateLimiter or
+    RedisRateLimiter) holds the quota instead of the local bucket, and 429 pauses are passed on to it.
+    """
+
+    def __init__(self, rate=8, period=1, user_per_minute=120, guild_per_minute=300, limiter=None):
+        self.bucket = TokenBucket(rate, period)
+        self.limiter = limiter
+        self.limiter_failed = False
+        self.tasks = set()
+        self.user_per_minute = user_per_minute
+        self.guild_per_minute = guild_per_minute
+        self.user_buckets = {}
+        self.guild_buckets = {}
+        self.queues = OrderedDict()
+        self.paused_until = 0
+        self.wakeup = asyncio.Event()
+        self.dispatcher = None
+
+    def close(self):
+        if self.dispatcher:
+            self.dispatcher.cancel()
+            self.dispatcher = None
+
+    def penalize(self, delay):
+        self.paused_until = max(self.paused_until, time.monotonic() + delay)
+        logging.warning(f"HackCheck API rate limited, pausing requests for {delay:.1f}s")
+        if self.limiter:
+            task = asyncio.create_task(self.limiter.penalize(delay))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+
+    async def take_shared(self):
+        """Takes a request slot from the shared limiter, returning how long to wait if there is none."""
+        try:
+            wait = await self.limiter.take()
+        except Exception as e:
+            # Keep serving searches at this process's own rate until the shared limiter is back.
+            if not self.limiter_failed:
+                logging.error(f"Shared API rate limiter unavailable, using the local quota: {e}")
+                self.limiter_failed = True
+            wait = self.bucket.wait_time()
+            if wait <= 0:
+                self.bucket.take()
+            return wait
+        if self.limiter_failed:
+            logging.info("Shared API rate limiter is available again")
+            self.limiter_failed = False
+        return wait
+
+    def budget(self, buckets, key, per_minute):
+        if key is None or not per_minute:
+            return None
+        bucket = buckets.get(key)
+        if bucket is None:
+            if len(buckets) > 10000:
+                for idle in [k for k, b in buckets.items() if b.is_full()]:
+                    del buckets[idle]
+            bucket = buckets[key] = TokenBucket(per_minute, 60)
+        return bucket
+
+    async def acquire(self, requester):
+        if self.dispatcher is None or self.dispatcher.done():
+            self.dispatcher = asyncio.create_task(self.dispatch())
+
+        future = asyncio.get_running_loop().create_future()
+        self.queues.setdefault(requester, deque()).append(future)
+        self.wakeup.set()
+        await future
+
+    async def sleep(self, delay):
+        self.wakeup.clear()
+        try:
+            await asyncio.wait_for(self.wakeup.wait(), delay)
+        except asyncio.TimeoutError:
+            pass
+
+    async def dispatch(self):
+        while True:
+            if not self.queues:
+                self.wakeup.clear()
+                await self.wakeup.wait()
+                continue
+
+            pause = self.paused_until - time.monotonic()
+            if pause > 0:
+                await asyncio.sleep(pause)
+                continue
+
+            if not self.limiter:
+                wait = self.bucket.wait_time()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                    continue
+
+            chosen = None
+            soonest = None
+            for requester in list(self.queues):
+                queue = self.queues[requester]
+                while queue and queue[0].done():
+                    queue.popleft()  # the caller was cancelled while waiting
+                if not queue:
+                    del self.queues[requester]
+                    continue
+
+                buckets = [
+                    self.budget(self.user_buckets, requester.user_id, requester.per_minute or self.user_per_minute),
+                    self.budget(self.guild_buckets, requester.guild_id, self.guild_per_minute),
+                ]
+                buckets = [bucket for bucket in buckets if bucket]
+                budget_wait = max((bucket.wait_time() for bucket in buckets), default=0)
+                if budget_wait > 0:
+                    soonest = budget_wait if soonest is None else min(soonest, budget_wait)
+                    continue
+                chosen = requester, queue, buckets
+                break
+
+            if chosen is None:
+                if soonest is not None:
+                    await self.sleep(soonest)
+                continue
+
+            requester, queue, buckets = chosen
+            if self.limiter:
+                wait = await self.take_shared()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                    continue
+                if queue[0].done():
+                    continue  # the caller was cancelled while the slot was being taken
+            else:
+                buckets.append(self.bucket)
+
+            for bucket in buckets:
+                bucket.take()
+            queue.popleft().set_result(None)
+            if queue:
+                self.queues.move_to_end(requester)
+            else:
+                del self.queues[requester]
+
+
+class SqliteRateLimiter:
+    """Cluster-wide API token bucket in a SQLite file, for worker processes on one machine.
+
+    Each take is a single IMMEDIATE transaction, so SQLite's file lock makes it atomic across
+    processes. Clocks are wall time, which every process on the machine agrees on.
+    """
+
+    def __init__(self, path, rate=8, period=1, name="hackcheck_api"):
+        self.path = path
+        self.rate = rate
+        self.period = period
+        self.name = name
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rate-limiter")
+        self.conn = None
+
+    async def _run(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+
+    async def start(self):
+        await self._run(self._open)
+        logging.info(f"Shared API rate limiter opened at {self.path}")
+
+    async def close(self):
+        if self.conn:
+            await self._run(self.conn.close)
+            self.conn = None
+        self.executor.shutdown(wait=False)
+
+    def _open(self):
+        self.conn = sqlite3.connect(self.path, timeout=10, isolation_level=None, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS rate_limits ("
+            "name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL, paused_until REAL NOT NULL)"
+        )
+
+    def _update(self, change):
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            now = time.time()
+            row = self.conn.execute("SELECT tokens, updated, paused_until FROM rate_limits WHERE name = ?", (self.name,)).fetchone()
+            tokens, updated, paused_until = row if row else (self.rate, now, 0)
+            tokens = min(self.rate, tokens + max(now - updated, 0) * self.rate / self.period)
+            tokens, paused_until, wait = change(now, tokens, paused_until)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO rate_limits (name, tokens, updated, paused_until) VALUES (?, ?, ?, ?)",
+                (self.name, tokens, now, paused_until),
+            )
+            self.conn.execute("COMMIT")
+            return wait
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    def _take(self, now, tokens, paused_until):
+        if paused_until > now:
+            return tokens, paused_until, paused_until - now
+        if tokens >= 1:
+            return tokens - 1, paused_until, 0
+        return tokens, paused_until, (1 - tokens) * self.period / self.rate
+
+    async def take(self):
+        """Takes a request slot if one is free; returns 0, or the seconds to wait before trying again."""
+        return await self._run(self._update, self._take)
+
+    async def penalize(self, delay):
+        try:
+            await self._run(self._update, lambda now, tokens, paused_until: (tokens, max(paused_until, now + delay), 0))
+        except Exception as e:
+            logging.error(f"Could not share the API rate limit pause: {e}")
+
+
+# Token bucket with a shared pause, run atomically inside Redis on the server's clock.
+# KEYS[1] is the bucket; ARGV is rate, period and a pause to apply (0 to take a slot instead).
+# Returns the seconds to wait as a string, since Redis would truncate a Lua number to an integer.
+REDIS_RATE_LIMIT_SCRIPT = """
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local rate = tonumber(ARGV[1])
+local period = tonumber(ARGV[2])
+local pause = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated', 'paused_until')
+local tokens = tonumber(state[1]) or rate
+local updated = tonumber(state[2]) or now
+local paused_until = tonumber(state[3]) or 0
+tokens = math.min(rate, tokens + math.max(now - updated, 0) * rate / period)
+local wait = 0
+if pause > 0 then
+    paused_until = math.max(paused_until, now + pause)
+elseif paused_until > now then
+    wait = paused_until - now
+elseif tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) * period / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now), 'paused_until', tostring(paused_until))
+redis.call('EXPIRE', KEYS[1], 3600)
+return tostring(wait)
+"""
+
+
+class RedisRateLimiter:
+    """Cluster-wide API token bucket in a Redis-compatible server, for workers on several machines."""
+
+    def __init__(self, url, rate=8, period=1, name="hackcheck:rate_limit"):
+        self.url = url
+        self.rate = rate
+        self.period = period
+        self.name = name
+        self.client = None
+        self.script = None
+
+    async def start(self):
+        self.client = aioredis.from_url(self.url)
+        self.script = self.client.register_script(REDIS_RATE_LIMIT_SCRIPT)
+        await self.client.ping()
+        logging.info("Shared API rate limiter connected to Redis")
+
+    async def close(self):
+        if self.client:
+            await self.client.aclose()
+            self.client = None
+
+    async def take(self):
+        """Takes a request slot if one is free; returns 0, or the seconds to wait before trying again."""
+        return float(await self.script(keys=[self.name], args=[self.rate, self.period, 0]))
+
+    async def penalize(self, delay):
+        try:
+            await self.script(keys=[self.name], args=[self.rate, self.period, delay])
+        except Exception as e:
+            logging.error(f"Could not share the API rate limit pause: {e}")
+
+
+def make_shared_backend(name, rate=8, period=1, primary=True):
+    """Builds the result cache and API rate limiter that worker processes share: "sqlite" or "redis"."""
+    if name == "redis" and aioredis is None:
+        logging.warning("redis is not installed, falling back to the SQLite shared backend")
+        name = "sqlite"
+    ttl = config.get("persistent_cache_ttl", 86400)
+    if name == "redis":
+        url = config.get("redis_url", "redis://localhost:6379/0")
+        return RedisResultCache(url, ttl=ttl), RedisRateLimiter(url, rate, period)
+
+    cache = PersistentResultCache(
+        config.get("persistent_cache_path", "hackcheck_cache.sqlite3"),
+        ttl=ttl,
+        compact_interval=config.get("persistent_cache_compact_interval", 3600) if primary else None,
+    )
+    return cache, SqliteRateLimiter(config.get("rate_limit_path", "hackcheck_ratelimit.sqlite3"), rate, period)
+
+
+def retry_after_seconds(response):
+    try:
+        return float(response.headers.get('Retry-After', ''))
+    except ValueError:
+        return None
+
+
+class RetryPolicy:
+    """Bounded retries with jittered exponential backoff, within an overall deadline for one search."""
+
+    def __init__(self, attempts=retry_attempts, backoff_factor=backoff_factor, max_delay=30, deadline=300):
+        self.attempts = attempts
+        self.backoff_factor = backoff_factor
+        self.max_delay = max_delay
+        self.deadline = time.monotonic() + deadline
+
+    def remaining(self):
+        return self.deadline - time.monotonic()
+
+    def delay(self, attempt, retry_after=None):
+        # "Full jitter": spreading retries out keeps concurrent pages from retrying in lockstep.
+        delay = random.uniform(0, min(self.max_delay, self.backoff_factor * 2 ** (attempt + 1)))
+        return max(delay, retry_after or 0)
+
+
+async def fetch_hackcheck_page(client, scheduler, requester, retry_policy, search_type, term, offset, limit):
+    # Returns the page data, {"error": ...} on a terminal error, or {"deadline": True} when the
+    # search ran out of time.
     api_key = config["hackcheck_api_key"]
-    all_results = []
-    offset = 0
-    limit = 75  # Adjust the limit as needed
-    page_count = 0
+    api_url = config.get("hackcheck_api_url", "https://api.hackcheck.io").rstrip("/")
+    url = f"{api_url}/search/{api_key}/{search_type.replace(' ', '_')}/{term}?offset={offset}&limit={limit}"
+    attempt = 0
 
-    async with aiohttp.ClientSession(timeout=timeout) as session:
-        has_more_data = True
+    while True:
+        retry_after = None
+        try:
+            with metrics.timer("hackcheck_api_scheduler_wait_seconds"):
+                await asyncio.wait_for(scheduler.acquire(requester), max(retry_policy.remaining(), 0))
+        except asyncio.TimeoutError:
+            # No request was sent, so this is not counted as an API request.
+            metrics.inc("hackcheck_api_scheduler_timeouts_total")
+            logging.warning(f"Search deadline reached at offset {offset} while waiting for an API request slot")
+            return {"deadline": True}
 
-        while has_more_data and page_count < max_pages:
-            async with limiter:
-                url = f"https://api.hackcheck.io/search/{api_key}/{search_type.replace(' ', '_')}/{term}?offset={offset}&limit={limit}"
-                try:
-                    async with session.get(url) as response:
-                        data = await response.json()  
+        try:
+            request_timeout = ClientTimeout(total=max(min(api_timeout.total, retry_policy.remaining()), 0.1))
+            with metrics.timer("hackcheck_api_page_seconds"):
+                async with client.get(url, timeout=request_timeout) as response:
+                    metrics.inc("hackcheck_api_requests_total", status=str(response.status))
+                    if response.status == 429 or response.status >= 500:
+                        error = f"API returned {response.status}"
+                        retry_after = retry_after_seconds(response)
+                        if response.status == 429:
+                            scheduler.penalize(retry_after or retry_policy.delay(attempt))
+                    else:
+                        body = await response.read()
                         if response.status != 200:
-                            error_message = data.get('error', 'Unknown error')
+                            try:
+                                data = page_decoder.decode(body)
+                                error_message = data.get('error', 'Unknown error') if isinstance(data, dict) else 'Unknown error'
+                            except ValueError:
+                                data = body[:500]
+                                error_message = f"HTTP {response.status}"
                             logging.error(f"API Error: {error_message}")
-                            logging.error(f"API Response: {data}")  
+                            logging.error(f"API Response: {data}")
                             return {"error": f"API Error: {error_message}"}
+                        return page_decoder.decode_page(body)
+
+        except aiohttp.ClientError as e:
+            metrics.inc("hackcheck_api_requests_total", status="error")
+            error = f"ClientError occurred: {e}"
+        except ValueError as e:
+            error = f"Invalid API response ({page_decoder.name}): {e}"
+        except asyncio.TimeoutError as e:
+            metrics.inc("hackcheck_api_requests_total", status="timeout")
+            error = f"TimeoutError occurred: {e}"
+        except Exception as e:
+            logging.error(f"An unexpected error occurred: {type(e).__name__}: {e}")
+            traceback_str = traceback.format_exc()
+            logging.error(f"Traceback: {traceback_str}")
+            return {"error": "An unexpected error occurred during the API request."}
+
+        if retry_policy.remaining() <= 0:
+            logging.warning(f"Search deadline reached at offset {offset}: {error}")
+            return {"deadline": True}
+        if attempt >= retry_policy.attempts:
+            logging.error(f"Giving up on offset {offset} after {attempt + 1} attempts: {error}")
+            return {"error": f"API request failed after {attempt + 1} attempts."}
+
+        delay = retry_policy.delay(attempt, retry_after)
+        if delay >= retry_policy.remaining():
+            logging.warning(f"Search deadline reached at offset {offset}: {error}")
+            return {"deadline": True}
+
+        attempt += 1
+        logging.warning(f"{error}, retrying offset {offset} in {delay:.1f}s (attempt {attempt}/{retry_policy.attempts})")
+        await asyncio.sleep(delay)
+
+
+async def make_hackcheck_request(client, scheduler, search_type, term, user_id=None, guild_id=None, max_pages=75, max_in_flight=None, per_minute=None):
+    # Async generator of {"results": [...]} batches in offset order, ending early with a single
+    # {"error": ...} batch on the first terminal error, or with a {"results": [], "partial": True}
+    # batch when the search deadline cuts it short. The first page tells us the page size (and
+    # the total, when the API reports one); the remaining pages are then fetched concurrently and
+    # each is yielded as soon as every page before it has arrived.
+    max_in_flight = max_in_flight or config.get("max_concurrent_pages", 4)
+    limit = 75  # Adjust the limit as needed
+    requester = ApiRequester(user_id, guild_id, per_minute)
+    retry_policy = RetryPolicy(deadline=config.get("search_deadline", 300))
 
-                        all_results.extend(data["results"])
-                        pagination_info = data.get('pagination', {})
+    started = time.perf_counter()
+    pages_fetched = 0
+    outcome = "cancelled"
+    pending = {}
 
-                        next_page = pagination_info.get('next')
-                        if next_page:
-                            offset = next_page['offset']
-                            limit = next_page['limit']
-                        else:
-                            has_more_data = False
+    try:
+        first_page = await fetch_hackcheck_page(client, scheduler, requester, retry_policy, search_type, term, 0, limit)
+        if "deadline" in first_page:
+            first_page = {"error": "The search timed out."}
+        if "error" in first_page:
+            outcome = "error"
+            yield first_page
+            return
 
-                        page_count += 1
+        pages_fetched = 1
+        yield {"results": first_page["results"]}
 
-                except aiohttp.ClientError as e:
-                    logging.error(f"ClientError occurred: {e}")
-                except json.JSONDecodeError as e:
-                    logging.error(f"JSONDecodeError occurred: {e}")
-                except asyncio.TimeoutError as e:
-                    logging.error(f"TimeoutError occurred: {e}")
-                except Exception as e:
-                    logging.error(f"An unexpected error occurred: {type(e).__name__}: {e}")
-                    traceback_str = traceback.format_exc() 
-                    logging.error(f"Traceback: {traceback_str}")
-                    return {"error": "An unexpected error occurred during the API request."}
+        pagination_info = first_page.get('pagination', {})
+        next_page = pagination_info.get('next')
+        if not next_page:
+            outcome = "complete"
+            return
+        if max_pages <= 1:
+            outcome = "truncated"
+            yield {"results": [], "truncated": True}
+            return
 
-    return {"results": all_results}
+        limit = next_page['limit']
+        next_offset = emit_offset = next_page['offset']
+        last_offset = next_offset + (max_pages - 2) * limit
+        total = pagination_info.get('total')
+        if isinstance(total, int):
+            last_offset = min(last_offset, total - 1)
+
+        pages = {}
+        end_offset = None
+        deadline_offset = None
+
+        while True:
+            while (len(pending) < max_in_flight and next_offset <= last_offset and deadline_offset is None
+                   and (end_offset is None or next_offset <= end_offset)):
+                task = asyncio.create_task(fetch_hackcheck_page(client, scheduler, requester, retry_policy, search_type, term, next_offset, limit))
+                pending[task] = next_offset
+                next_offset += limit
+
+            if not pending:
+                if end_offset is None:
+                    # Stopped by max_pages while the API still had more pages.
+                    outcome = "truncated"
+                    yield {"results": [], "truncated": True}
+                else:
+                    outcome = "complete"
+                break
 
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                offset = pending.pop(task)
+                data = task.result()
+                if "error" in data:
+                    outcome = "error"
+                    yield data
+                    return
+                if "deadline" in data:
+                    deadline_offset = offset if deadline_offset is None else min(deadline_offset, offset)
+                    continue
+
+                pages_fetched += 1
+                pages[offset] = data["results"]
+                if not data["results"] or not data.get('pagination', {}).get('next'):
+                    end_offset = offset if end_offset is None else min(end_offset, offset)
+
+            cutoff = min((o for o in (end_offset, deadline_offset) if o is not None), default=None)
+            if cutoff is not None:
+                for task, offset in list(pending.items()):
+                    if offset > cutoff:
+                        task.cancel()
+                        del pending[task]
+
+            while emit_offset in pages and (end_offset is None or emit_offset <= end_offset):
+                yield {"results": pages.pop(emit_offset)}
+                emit_offset += limit
+
+            if (deadline_offset is not None and emit_offset >= deadline_offset
+                    and (end_offset is None or deadline_offset <= end_offset)):
+                # Everything before the page that ran out of time has been emitted. A page past
+                # the last one running out of time doesn't matter; that search is complete.
+                outcome = "partial"
+                yield {"results": [], "partial": True}
+                return
+    finally:
+        for task in pending:
+            task.cancel()
+        metrics.inc("hackcheck_searches_total", outcome=outcome)
+        metrics.observe("hackcheck_search_seconds", time.perf_counter() - started)
+        metrics.observe("hackcheck_search_pages", pages_fetched, buckets=PAGE_COUNT_BUCKETS)
 
-def format_breaches(term, search_type, response):
-    header = f"{term}:\n\n"
 
+class InFlightSearch:
+    """A running search whose batches are replayed to every caller that joins it."""
+
+    def __init__(self):
+        self.batches = []
+        self.done = False
+        self.changed = asyncio.Condition()
+        self.task = None
+        self.subscribers = 0
+
+    async def run(self, batches):
+        try:
+            async for batch in batches:
+                async with self.changed:
+                    self.batches.append(batch)
+                    self.changed.notify_all()
+        except Exception as e:
+            logging.error(f"An unexpected error occurred during a shared search: {type(e).__name__}: {e}")
+            async with self.changed:
+                self.batches.append({"error": "An unexpected error occurred during the API request."})
+        finally:
+            async with self.changed:
+                self.done = True
+                self.changed.notify_all()
+
+    async def subscribe(self):
+        # subscribers counts the callers still reading, so one that finishes or is cancelled leaves.
+        self.subscribers += 1
+        try:
+            index = 0
+            while True:
+                async with self.changed:
+                    await self.changed.wait_for(lambda: index < len(self.batches) or self.done)
+                    pending = self.batches[index:]
+                    finished = self.done
+                for batch in pending:
+                    yield batch
+                index += len(pending)
+                if finished and index >= len(self.batches):
+                    return
+        finally:
+            self.subscribers -= 1
+
+
+async def fetch_and_cache_breaches(bot, key, user_id=None, guild_id=None):
+    if bot.persistent_cache:
+        cached = await bot.persistent_cache.get(key)
+        if cached is not None:
+            bot.result_cache.put(key, cached)
+            yield {"results": cached, "cached": True}
+            return
+
+    results = BreachResults()
+    truncated = False
+    async for batch in make_hackcheck_request(bot.http_client, bot.api_scheduler, key[0], key[1], user_id, guild_id):
+        yield batch
+        if "error" in batch or batch.get("partial"):
+            return
+        truncated = truncated or batch.get("truncated", False)
+        results.extend(batch["results"])
+
+    bot.result_cache.put(key, results, complete=not truncated)
+    if bot.persistent_cache:
+        await bot.persistent_cache.put(key, results)
+
+
+async def search_breaches(bot, search_type, term, user_id=None, guild_id=None):
+    # Same batches as make_hackcheck_request, answered from the result cache (or the index over it)
+    # when possible.
+    # Identical searches already running are joined rather than started again, and only searches
+    # that completed without an error or a deadline cut-off are cached.
+    key = normalize_search_key(search_type, term)
+    cached = bot.result_cache.get(key)
+    if cached is not None:
+        logging.info(f"Result cache hit for {search_type} search ({len(cached)} results)")
+        yield {"results": cached, "cached": True}
+        return
+
+    covered = bot.result_index.lookup(search_type, term)
+    if covered is not None and bot.result_cache.peek(covered[1]) is not None:
+        results, covering_key, fetched_at = covered
+        logging.info(f"Answered {search_type} search from the cached {covering_key[0]} search ({len(results)} results)")
+        metrics.inc("hackcheck_index_answers_total")
+        # Cache the answer under its own key too, so its paginator can be reloaded by handle.
+        bot.result_cache.put(key, results)
+        yield {"results": results, "cached": True, "covered_by": covering_key, "fetched_at": fetched_at}
+        return
+
+    flight = bot.in_flight_searches.get(key)
+    if flight is None:
+        flight = InFlightSearch()
+        bot.in_flight_searches[key] = flight
+        flight.task = asyncio.create_task(flight.run(fetch_and_cache_breaches(bot, key, user_id, guild_id)))
+
+        def forget(_, flight=flight):
+            if bot.in_flight_searches.get(key) is flight:
+                del bot.in_flight_searches[key]
+
+        flight.task.add_done_callback(forget)
+    else:
+        logging.info(f"Joining in-flight {search_type} search ({flight.subscribers} already waiting)")
+
+    async for batch in flight.subscribe():
+        yield batch
+
+
+def format_breaches_header(term):
+    return f"{term}:\n\n"
+
+
+def format_breach(breach):
+    details = []
+    source_name = breach.get("source_name", "Unknown source")
+    date = breach.get("source_date", "No date")
+
+    details.append(f"- Source: {source_name} ({date})")  
+
+    for key in BREACH_FIELDS:
+        value = breach.get(key)
+        if value:
+            details.append(f"  {key.replace('_', ' ').capitalize()}: {value}")
+
+    return '\n'.join(details)
+
+
+def format_breaches(term, search_type, response):
     if not response or "results" not in response or not response["results"]:
         return f"No breaches found for {search_type} '{term}'."
 
-    breach_list = []
-    for breach in response["results"]:
-        details = []
-        source_info = breach.get("source", {})
-        source_name = source_info.get("name", "Unknown source")
-        date = source_info.get("date", "No date")  
+    breach_list = [format_breach(breach) for breach in response["results"]]
+    return format_breaches_header(term) + '\n\n'.join(breach_list)
 
-        details.append(f"- Source: {source_name} ({date})")  
 
-        for key in ["email", "password", "username", "full_name", "ip_address", "phone_number", "hash"]:
-            value = breach.get(key)
-            if value:
-                details.append(f"  {key.replace('_', ' ').capitalize()}: {value}")
+# Lower runs first: single-record lookups ahead of searches that can fan out into many pages.
+SEARCH_PRIORITIES = {
+    "email": 0,
+    "phone number": 0,
+    "username": 1,
+    "full name": 1,
+    "ip address": 1,
+    "password": 2,
+    "hash": 2,
+    "domain": 3,
+    "bulk": 4,
+}
 
-        breach_list.append('\n'.join(details))
 
-    return header + '\n\n'.join(breach_list)
+class SearchQueueFull(Exception):
+    pass
 
 
-async def attempt_delete_with_retries(filename, max_attempts=5):
-    attempt = 0
-    while attempt < max_attempts:
-        try:
-            os.remove(filename)
-            return True  
-        except PermissionError as e:
-            logging.warning(f"PermissionError when trying to delete file {filename}. Retrying... Attempt {attempt + 1}/{max_attempts}")
-            await asyncio.sleep(1)  
-        except FileNotFoundError:
-            logging.warning(f"File {filename} not found. It may have already been deleted.")
-            return False  
-        except Exception as e:
-            logging.error(f"Failed to delete file {filename} on attempt {attempt + 1}: {e}")
-            break  
-        finally:
-            attempt += 1
+class SearchJob:
+    def __init__(self, search_type, user_id, guild_id, run, expires_at=None):
+        self.priority = SEARCH_PRIORITIES.get(search_type, 2)
+        self.search_type = search_type
+        self.user_id = user_id
+        self.guild_id = guild_id
+        self.run = run
+        self.expires_at = expires_at
+        self.sequence = 0
+        self.queued_at = time.monotonic()
+
+
+class SearchQueue:
+    """Bounded pool of search workers with per-user and per-guild concurrency caps.
+
+    Waiting jobs are picked by priority, then arrival order, skipping any whose user, guild or
+    search type is already at its cap. New jobs are rejected once the queue (or the user's share of
+    it) is full.
+    """
+
+    def __init__(self, workers=4, max_queue=50, per_user=1, per_guild=3, per_user_queued=3, per_type=None):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.per_user = per_user
+        self.per_guild = per_guild
+        self.per_user_queued = per_user_queued
+        self.per_type = per_type or {}  # e.g. keeps long bulk jobs from taking every worker
+        self.waiting = []
+        self.running_users = {}
+        self.running_guilds = {}
+        self.running_types = {}
+        self.running = 0
+        self.sequence = 0
+        self.changed = asyncio.Condition()
+        self.tasks = []
+
+    def start(self):
+        self.tasks = [asyncio.create_task(self.worker()) for _ in range(self.workers)]
+
+    def close(self):
+        for task in self.tasks:
+            task.cancel()
+        self.tasks = []
+
+    def ordered(self):
+        return sorted(self.waiting, key=lambda job: (job.priority, job.sequence))
+
+    def position(self, job):
+        """1-based place in line, or 0 once the job has started."""
+        ordered = self.ordered()
+        return ordered.index(job) + 1 if job in ordered else 0
+
+    def will_wait(self, job):
+        position = self.position(job)
+        return position > 1 or (position == 1 and (self.running >= self.workers or not self.can_run(job)))
+
+    async def submit(self, job):
+        if len(self.waiting) >= self.max_queue:
+            raise SearchQueueFull("Too many searches are queued right now.")
+        if sum(1 for waiting in self.waiting if waiting.user_id == job.user_id) >= self.per_user_queued:
+            raise SearchQueueFull("You already have several searches waiting.")
+
+        self.sequence += 1
+        job.sequence = self.sequence
+        async with self.changed:
+            self.waiting.append(job)
+            self.changed.notify_all()
+        return self.position(job)
+
+    def can_run(self, job):
+        if self.running_users.get(job.user_id, 0) >= self.per_user:
+            return False
+        if job.guild_id is not None and self.running_guilds.get(job.guild_id, 0) >= self.per_guild:
+            return False
+        if job.search_type in self.per_type and self.running_types.get(job.search_type, 0) >= self.per_type[job.search_type]:
+            return False
+        return True
+
+    def next_job(self):
+        for job in self.ordered():
+            if self.can_run(job):
+                return job
+        return None
+
+    async def worker(self):
+        while True:
+            async with self.changed:
+                await self.changed.wait_for(lambda: self.next_job() is not None)
+                job = self.next_job()
+                self.waiting.remove(job)
+                metrics.observe("hackcheck_search_queue_wait_seconds", time.monotonic() - job.queued_at)
+                self.running += 1
+                self.running_users[job.user_id] = self.running_users.get(job.user_id, 0) + 1
+                if job.guild_id is not None:
+                    self.running_guilds[job.guild_id] = self.running_guilds.get(job.guild_id, 0) + 1
+                self.running_types[job.search_type] = self.running_types.get(job.search_type, 0) + 1
+
+            try:
+                if job.expires_at and time.time() > job.expires_at:
+                    logging.warning(f"Dropping {job.search_type} search that expired while queued")
+                else:
+                    await job.run()
+            except Exception as e:
+                logging.error(f"Unhandled exception in search worker: {type(e).__name__}: {e}")
+            finally:
+                async with self.changed:
+                    self.running -= 1
+                    self.running_users[job.user_id] -= 1
+                    if not self.running_users[job.user_id]:
+                        del self.running_users[job.user_id]
+                    if job.guild_id is not None:
+                        self.running_guilds[job.guild_id] -= 1
+                        if not self.running_guilds[job.guild_id]:
+                            del self.running_guilds[job.guild_id]
+                    self.running_types[job.search_type] -= 1
+                    if not self.running_types[job.search_type]:
+                        del self.running_types[job.search_type]
+                    self.changed.notify_all()
+
+
+WEBHOOK_MAX_EMBEDS = 10
+WEBHOOK_MAX_EMBED_CHARS = 6000
+
+
+def embed_length(embed):
+    """Characters Discord counts toward the 6000-per-message embed limit."""
+    length = len(embed.get("title") or "") + len(embed.get("description") or "")
+    length += len((embed.get("footer") or {}).get("text") or "") + len((embed.get("author") or {}).get("name") or "")
+    for field in embed.get("fields", ()):
+        length += len(field.get("name") or "") + len(field.get("value") or "")
+    return length
+
+
+class WebhookDispatcher:
+    """Delivers audit-log webhook posts from a background task so callers never wait on them.
+
+    Embeds queued within flush_interval of each other for the same webhook are sent together,
+    up to Discord's 10 per message. Posts pause while the X-RateLimit bucket is empty and after
+    a 429, and failed posts are retried with backoff. When the queue is full, new posts are
+    dropped with a warning rather than holding up the caller.
+    """
+
+    def __init__(self, client, max_queue=500, flush_interval=2, max_attempts=5):
+        self.client = client
+        self.queue = asyncio.Queue(max_queue)
+        self.flush_interval = flush_interval
+        self.max_attempts = max_attempts
+        self.resume_at = 0
+        self.carried = None
+        self.dropped = 0
+        self.task = None
+
+    def start(self):
+        self.task = asyncio.create_task(self.run())
+
+    async def close(self, timeout=5):
+        """Gives queued posts up to timeout seconds to go out, then stops."""
+        if self.task is None:
+            return
+        try:
+            await asyncio.wait_for(self.queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logging.warning(f"Discarding {self.queue.qsize()} undelivered webhook messages")
+        self.task.cancel()
+        self.task = None
+
+    def send(self, url, embeds=None, content=None, username=None):
+        if not url:
+            return
+        try:
+            self.queue.put_nowait((url, username, content, list(embeds or ())))
+        except asyncio.QueueFull:
+            self.dropped += 1
+            logging.warning("Webhook queue is full, dropping a message")
+
+    def can_merge(self, batch, message):
+        url, username, content, embeds = message
+        return (
+            content is None and batch[2] is None
+            and (url, username) == batch[:2]
+            and len(batch[3]) + len(embeds) <= WEBHOOK_MAX_EMBEDS
+            and sum(map(embed_length, batch[3] + embeds)) <= WEBHOOK_MAX_EMBED_CHARS
+        )
+
+    async def next_batch(self):
+        """Takes the next message and folds in any embeds queued behind it within flush_interval."""
+        first, self.carried = self.carried or await self.queue.get(), None
+        url, username, content, embeds = first
+        batch = (url, username, content, list(embeds))
+        taken = 1
+        if content is None:
+            flush_at = time.monotonic() + self.flush_interval
+            while len(batch[3]) < WEBHOOK_MAX_EMBEDS:
+                try:
+                    message = await asyncio.wait_for(self.queue.get(), max(flush_at - time.monotonic(), 0))
+                except asyncio.TimeoutError:
+                    break
+                if not self.can_merge(batch, message):
+                    self.carried = message
+                    break
+                batch[3].extend(message[3])
+                taken += 1
+        return batch, taken
+
+    async def run(self):
+        while True:
+            (url, username, content, embeds), taken = await self.next_batch()
+            payload = {"content": content}
+            if username:
+                payload["username"] = username
+            if embeds:
+                payload["embeds"] = embeds
+            try:
+                await self.deliver(url, payload)
+            except Exception as e:
+                logging.error(f"Error sending webhook message: {type(e).__name__}: {e}")
+            finally:
+                for _ in range(taken):
+                    self.queue.task_done()
 
-    logging.error(f"Could not delete file {filename} after {max_attempts} attempts.")
-    return False  
+    def track_rate_limit(self, response):
+        try:
+            remaining = int(response.headers.get("X-RateLimit-Remaining", 1))
+            reset_after = float(response.headers.get("X-RateLimit-Reset-After", 0))
+        except ValueError:
+            return
+        if remaining <= 0:
+            self.resume_at = max(self.resume_at, time.monotonic() + reset_after)
+
+    async def deliver(self, url, payload):
+        retry_policy = RetryPolicy(attempts=self.max_attempts, deadline=float("inf"))
+        for attempt in range(self.max_attempts):
+            wait = self.resume_at - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            retry_after = None
+            try:
+                async with self.client.post(url, json=payload) as response:
+                    self.track_rate_limit(response)
+                    if response.status in (200, 204):
+                        return True
+                    if response.status == 429:
+                        try:
+                            retry_after = float((await response.json(content_type=None)).get("retry_after"))
+                        except (ValueError, TypeError, AttributeError):
+                            retry_after = retry_after_seconds(response) or 1
+                        self.resume_at = max(self.resume_at, time.monotonic() + retry_after)
+                        logging.warning(f"Webhook rate limited, retrying in {retry_after:.1f}s")
+                        continue
+                    if response.status < 500:
+                        logging.error(f"Webhook failed with status code {response.status}")
+                        return False
+                    logging.warning(f"Webhook failed with status code {response.status}, retrying")
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logging.warning(f"Webhook post failed ({type(e).__name__}: {e}), retrying")
+            await asyncio.sleep(retry_policy.delay(attempt))
+        logging.error(f"Giving up on webhook message after {self.max_attempts} attempts")
+        return False
 
 
 class SearchModal(Modal):
@@ -371,56 +2746,95 @@ class SearchModal(Modal):
             await interaction.response.send_message("The provided email is invalid. Please enter a valid email address.")
             return
 
-        asyncio.create_task(self.send_webhook_message(interaction.user, term, interaction, interaction.guild))
+        self.send_webhook_message(interaction.user, term, interaction, interaction.guild)
         await interaction.response.defer(ephemeral=False)
 
-        asyncio.create_task(self.process_search(interaction, term))
-        
-    async def process_search(self, interaction: discord.Interaction, term: str):
+        guild_id = interaction.guild.id if interaction.guild else None
+        # The job can start as soon as it's queued, before the status message below has been sent,
+        # so it waits for the message on this future.
+        status = asyncio.get_running_loop().create_future()
+        job = SearchJob(
+            self.search_type,
+            interaction.user.id,
+            guild_id,
+            lambda: self.process_search(interaction, term, status),
+            expires_at=interaction.created_at.timestamp() + 14 * 60,
+        )
         try:
-            await interaction.followup.send("Processing your search. Please wait...")
-
-            full_results = await make_hackcheck_request(self.search_type, term)
-            if "error" in full_results:
-                logging.error(full_results["error"])
-                await interaction.followup.send("An error occurred while processing your request. Please try again later.")
-                return
+            position = await self.bot.search_queue.submit(job)
+        except SearchQueueFull as e:
+            logging.warning(f"Rejected search from {interaction.user}: {e}")
+            await interaction.followup.send(f"The bot is busy. {e} Please try again in a few minutes.")
+            return
 
-            reversed_results = list(reversed(full_results["results"]))
-            paginator_view = PaginatorView(reversed_results, term, self.search_type)
-            self.paginator_view = paginator_view  
-            content = format_breaches(term, self.search_type, {"results": reversed_results[:paginator_view.page_size]})
-            message = await interaction.followup.send(content=content, view=paginator_view)
-            paginator_view.message = message
+        status_message = None
+        try:
+            if self.bot.search_queue.will_wait(job):
+                status_message = await interaction.followup.send(f"Processing your search. Please wait... (position {position} in queue)")
+            else:
+                status_message = await interaction.followup.send("Processing your search. Please wait...")
+        finally:
+            status.set_result(status_message)
 
-            csv_filename, pdf_filename = await self.generate_reports(reversed_results)
-            if csv_filename and pdf_filename:
-                await self.send_reports(interaction, csv_filename, pdf_filename, term, interaction.user.display_name)
+    async def process_search(self, interaction: discord.Interaction, term: str, status=None):
+        self.bot.profiler.search_started()
+        try:
+            status_message = await status if status else None
+            if status_message and "in queue" in status_message.content:
+                await status_message.edit(content="Processing your search. Please wait...")
+
+            paginator_view = None
+            partial = False
+            covered_by = None
+            guild_id = interaction.guild.id if interaction.guild else None
+            async for batch in search_breaches(self.bot, self.search_type, term, interaction.user.id, guild_id):
+                if "error" in batch:
+                    logging.error(batch["error"])
+                    if paginator_view:
+                        await paginator_view.finish()
+                    await interaction.followup.send("An error occurred while processing your request. Please try again later.")
+                    return
+
+                if batch.get("partial"):
+                    partial = True
+                if batch.get("covered_by"):
+                    covered_by = batch
+                if paginator_view is None:
+                    # Show the first page as soon as it lands; later batches grow the paginator.
+                    paginator_view = PaginatorView(batch["results"], term, self.search_type, complete=batch.get("cached", False))
+                    paginator_view.message = await interaction.followup.send(content=paginator_view.render(), view=paginator_view)
+                    paginator_view.last_refresh = time.monotonic()
+                else:
+                    await paginator_view.extend(batch["results"])
+
+            results = paginator_view.data
+            # Partial results get persistent buttons too; they page from memory until evicted.
+            handle = search_handle(normalize_search_key(self.search_type, term)) if results else None
+            await paginator_view.finish(self.bot, handle)
+            if covered_by:
+                minutes = int((time.time() - covered_by["fetched_at"]) // 60)
+                await interaction.followup.send(f"Answered from a {covered_by['covered_by'][0]} search of `{covered_by['covered_by'][1]}` fetched {minutes} minutes ago.")
+            if partial:
+                await interaction.followup.send("The search took too long to finish, so these results are incomplete.")
+
+            reversed_results = results.reversed()
+            # Interaction tokens are valid for 15 minutes; leave a margin to upload the files.
+            deadline = interaction.created_at.timestamp() + 15 * 60 - 30
+            reports = await self.generate_reports(reversed_results, upload_limit(interaction), deadline=deadline)
+            if reports:
+                await self.send_reports(interaction, reports, term, interaction.user.display_name)
 
         except Exception as e:
             logging.error(f"An unexpected error occurred: {e}")
             await interaction.followup.send("An unexpected error occurred. Please try again later.")
 
-    async def send_webhook_message(self, user, term, interaction, guild):
-        webhook_url = config["webhook_url"]
-        search_info = f"Search performed by {user.display_name}"
+    def send_webhook_message(self, user, term, interaction, guild):
         user_avatar_url = user.avatar.url if user.avatar else None
         embed_content = self.construct_embed(user, term, guild, user_avatar_url)
-        webhook_data = {
-            "content": None,
-            "username": "HackCheck Bot",
-            "embeds": [embed_content],
-        }
-
-        async with aiohttp.ClientSession() as session:
-            try:
-                response = await session.post(webhook_url, json=webhook_data)
-                if response.status != 204:
-                    logging.error(f"Webhook failed with status code {response.status}")
-            except Exception as e:
-                logging.error(f"An error occurred while sending the webhook message: {e}")
+        self.bot.webhook_dispatcher.send(config["webhook_url"], embeds=[embed_content], username="HackCheck Bot")
 
-    def construct_embed(self, user, term, guild, avatar_url):
+    @staticmethod
+    def construct_embed(user, term, guild, avatar_url):
         server_info = f"**Name:** {guild.name}\n**Members:** {guild.member_count}" if guild else "Direct Message"
         return {
             "title": "🔍 New Search Performed",
@@ -432,30 +2846,465 @@ class SearchModal(Modal):
             "timestamp": datetime.utcnow().isoformat()
         }
 
-    async def generate_reports(self, results):
+    async def generate_reports(self, results, size_limit=None, deadline=None):
+        if not results:
+            return None
         try:
-            csv_filename = create_csv_file(results, "full_results")
-            pdf_filename = create_pdf_from_csv(csv_filename, "full_results") if csv_filename else None
-            return csv_filename, pdf_filename
+            with metrics.timer("hackcheck_report_render_seconds"):
+                reports = await self.bot.report_renderer.render(results, size_limit=size_limit, deadline=deadline)
+            metrics.inc("hackcheck_reports_total", outcome="ok")
+            return reports
+        except ReportQueueFull as e:
+            metrics.inc("hackcheck_reports_total", outcome="busy")
+            logging.warning(f"Skipping reports, renderer is busy: {e}")
+            return None
+        except asyncio.TimeoutError:
+            metrics.inc("hackcheck_reports_total", outcome="timeout")
+            logging.warning("Report rendering timed out or the interaction expired")
+            return None
         except Exception as e:
+            metrics.inc("hackcheck_reports_total", outcome="error")
             logging.error(f"Error generating reports: {e}")
-            return None, None
+            return None
 
-    async def send_reports(self, interaction, csv_filename, pdf_filename, term, username):
+    async def send_reports(self, interaction, reports, term, username):
+        timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+        started = time.perf_counter()
         try:
-            if csv_filename:
-                await interaction.followup.send("Here's the full report in CSV format:", file=discord.File(csv_filename))
-            if pdf_filename:
-                await interaction.followup.send("Here's the full report in PDF format:", file=discord.File(pdf_filename))
+            for kind in ("csv", "pdf"):
+                files = reports[kind]
+                if not files:
+                    await interaction.followup.send(f"The {kind.upper()} report was too large to upload.")
+                    continue
+                for index, (suffix, data) in enumerate(files):
+                    report_file = discord.File(io.BytesIO(data), filename=f"full_results_{timestamp}{suffix}")
+                    if len(files) > 1:
+                        message = f"Here's the full report in {kind.upper()} format (part {index + 1} of {len(files)}):"
+                    else:
+                        message = f"Here's the full report in {kind.upper()} format:"
+                    await interaction.followup.send(message, file=report_file)
+                    metrics.inc("hackcheck_report_upload_bytes_total", len(data), format=kind)
+            metrics.observe("hackcheck_report_upload_seconds", time.perf_counter() - started)
             await interaction.followup.send(f"Finished searching `{term}` for `{username}`")
-            await asyncio.gather(
-                attempt_delete_with_retries(csv_filename),
-                attempt_delete_with_retries(pdf_filename)
-            )
         except Exception as e:
             logging.error(f"Error sending reports: {e}")
 
 
+SEARCH_TYPES = ["Email", "Password", "Username", "Full Name", "IP Address", "Phone Number", "Hash", "Domain"]
+
+# How a pasted list is split into terms. Names and passwords can contain spaces and commas, so
+# they are taken one per line.
+BULK_SEPARATORS = {
+    "email": r"[\s,;]+",
+    "username": r"[\s,;]+",
+    "ip address": r"[\s,;]+",
+    "hash": r"[\s,;]+",
+    "domain": r"[\s,;]+",
+    "phone number": r"[\r\n,;]+",
+}
+BULK_TERM_MAX_LENGTH = 256
+
+
+def parse_bulk_terms(text, search_type, from_csv=False):
+    """Splits a pasted list or uploaded file into unique, valid search terms in input order.
+
+    CSV files use the column headed by the search type (e.g. "email") if there is one, otherwise
+    the first column. Returns (terms, invalid, duplicates).
+    """
+    if from_csv:
+        rows = [row for row in csv.reader(io.StringIO(text)) if any(cell.strip() for cell in row)]
+        column = 0
+        if rows:
+            header = [cell.strip().casefold().replace("_", " ") for cell in rows[0]]
+            if search_type in header:
+                column = header.index(search_type)
+                rows = rows[1:]
+        candidates = [row[column] if column < len(row) else "" for row in rows]
+    else:
+        candidates = re.split(BULK_SEPARATORS.get(search_type, r"[\r\n]+"), text)
+
+    terms = []
+    seen = set()
+    invalid = duplicates = 0
+    for candidate in candidates:
+        term = candidate.strip()
+        if not term:
+            continue
+        if len(term) > BULK_TERM_MAX_LENGTH or (search_type == "email" and not validate_email(term)):
+            invalid += 1
+            continue
+        key = normalize_search_key(search_type, term)
+        if key in seen:
+            duplicates += 1
+            continue
+        seen.add(key)
+        terms.append(term)
+    return terms, invalid, duplicates
+
+
+class BulkSearchModal(Modal):
+    def __init__(self, search_type):
+        super().__init__(title=f"Bulk search by {search_type.capitalize()}")
+        self.search_type = search_type
+        self.add_item(TextInput(
+            label=f"{search_type.capitalize()} list",
+            style=discord.TextStyle.paragraph,
+            placeholder="One per line",
+            max_length=4000,
+            custom_id="bulk_terms",
+        ))
+
+    async def on_submit(self, interaction: discord.Interaction):
+        await start_bulk_search(interaction, self.search_type, self.children[0].value)
+
+
+async def start_bulk_search(interaction, search_type, text, from_csv=False):
+    bot = interaction.client
+    terms, invalid, duplicates = parse_bulk_terms(text, search_type, from_csv)
+    skipped = []
+    if invalid:
+        skipped.append(f"{invalid} invalid")
+    if duplicates:
+        skipped.append(f"{duplicates} duplicate")
+    max_terms = config.get("bulk_max_terms", 500)
+    if len(terms) > max_terms:
+        skipped.append(f"{len(terms) - max_terms} over the {max_terms}-term limit")
+        terms = terms[:max_terms]
+    if not terms:
+        await interaction.response.send_message(f"No valid {search_type} terms were found in that list.", ephemeral=True)
+        return
+
+    guild_name = interaction.guild.name if interaction.guild else "Direct Message"
+    logging.info(f"{interaction.user} started a bulk {search_type} search of {len(terms)} terms at '{guild_name}'")
+    avatar_url = interaction.user.avatar.url if interaction.user.avatar else None
+    embed = SearchModal.construct_embed(interaction.user, f"{len(terms)} {search_type} terms (bulk)", interaction.guild, avatar_url)
+    bot.webhook_dispatcher.send(config["webhook_url"], embeds=[embed], username="HackCheck Bot")
+    await interaction.response.defer(ephemeral=False)
+
+    guild_id = interaction.guild.id if interaction.guild else None
+    # As with single searches, the job may start before the status message is sent.
+    status = asyncio.get_running_loop().create_future()
+    job = SearchJob(
+        "bulk",
+        interaction.user.id,
+        guild_id,
+        lambda: run_bulk_search(interaction, search_type, terms, skipped, status),
+        expires_at=interaction.created_at.timestamp() + 12 * 60,
+    )
+    try:
+        position = await bot.search_queue.submit(job)
+    except SearchQueueFull as e:
+        logging.warning(f"Rejected bulk search from {interaction.user}: {e}")
+        await interaction.followup.send(f"The bot is busy. {e} Please try again in a few minutes.")
+        return
+
+    status_message = None
+    message = f"Checking {len(terms)} {search_type} terms. Please wait..."
+    if bot.search_queue.will_wait(job):
+        message += f" (position {position} in queue)"
+    try:
+        status_message = await interaction.followup.send(message)
+    finally:
+        status.set_result(status_message)
+
+
+async def run_bulk_search(interaction, search_type, terms, skipped, status=None):
+    bot = interaction.client
+    bot.profiler.search_started()
+    status_message = await status if status else None
+    guild_id = interaction.guild.id if interaction.guild else None
+    # Stop starting new terms in time to render and upload the report before the interaction expires.
+    expires_at = interaction.created_at.timestamp() + 15 * 60
+    cutoff = expires_at - 120
+    semaphore = asyncio.Semaphore(config.get("bulk_concurrency", 4))
+    outcomes = {}
+    last_update = time.monotonic()
+
+    async def check(term):
+        nonlocal last_update
+        async with semaphore:
+            if time.time() > cutoff:
+                outcomes[term] = ("not checked", None)
+                return
+            status = "found"
+            results = BreachResults()
+            async for batch in search_breaches(bot, search_type, term, interaction.user.id, guild_id):
+                if "error" in batch:
+                    logging.error(f"Bulk search of '{term}' failed: {batch['error']}")
+                    status = "error"
+                    break
+                if batch.get("partial"):
+                    status = "partial"
+                results.extend(batch["results"])
+            if status == "found" and not results:
+                status = "no results"
+            outcomes[term] = (status, results)
+
+        if status_message and time.monotonic() - last_update >= 3:
+            last_update = time.monotonic()
+            try:
+                await status_message.edit(content=f"Checking {len(terms)} {search_type} terms... {len(outcomes)} done.")
+            except discord.HTTPException as e:
+                logging.error(f"HTTP error while updating bulk search progress: {e}")
+
+    try:
+        await asyncio.gather(*(check(term) for term in terms))
+
+        bulk = BulkResults()
+        summary = []
+        for term in terms:
+            status, results = outcomes[term]
+            summary.append((term, status, len(results) if results else 0))
+            if results:
+                bulk.add(term, results)
+        metrics.inc("hackcheck_bulk_searches_total")
+        metrics.inc("hackcheck_bulk_terms_total", len(terms))
+
+        await interaction.followup.send(format_bulk_summary(search_type, summary, len(bulk), skipped))
+
+        try:
+            reports = await bot.report_renderer.run(render_bulk_report, bulk.compact(), summary, upload_limit(interaction), deadline=expires_at - 30)
+        except ReportQueueFull as e:
+            logging.warning(f"Skipping bulk report, renderer is busy: {e}")
+            await interaction.followup.send("The report could not be built right now because the bot is busy.")
+            return
+        except asyncio.TimeoutError:
+            logging.warning("Bulk report rendering timed out or the interaction expired")
+            return
+
+        timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+        await interaction.followup.send("Per-term summary:", file=discord.File(io.BytesIO(reports["summary"][0][1]), filename=f"bulk_summary_{timestamp}.csv"))
+        files = reports["csv"]
+        if bulk and not files:
+            await interaction.followup.send("The combined results were too large to upload.")
+        for index, (suffix, data) in enumerate(files):
+            part = f" (part {index + 1} of {len(files)})" if len(files) > 1 else ""
+            await interaction.followup.send(f"All results{part}:", file=discord.File(io.BytesIO(data), filename=f"bulk_results_{timestamp}{suffix}"))
+    except Exception as e:
+        logging.error(f"An unexpected error occurred in a bulk search: {type(e).__name__}: {e}")
+        await interaction.followup.send("An unexpected error occurred. Please try again later.")
+
+
+def format_bulk_summary(search_type, summary, total_results, skipped):
+    found = [(term, count) for term, status, count in summary if count]
+    lines = [f"Bulk {search_type} search finished: {len(found)} of {len(summary)} terms found in breaches, {total_results} results in total."]
+    incomplete = sum(1 for _, status, _ in summary if status in ("error", "partial", "not checked"))
+    if incomplete:
+        lines.append(f"{incomplete} terms could not be fully checked; see the summary file.")
+    if skipped:
+        lines.append(f"Skipped {', '.join(skipped)} terms.")
+
+    limit = DISCORD_MESSAGE_LIMIT - 100
+    length = sum(len(line) + 1 for line in lines)
+    for index, (term, count) in enumerate(sorted(found, key=lambda item: item[1], reverse=True)):
+        line = f"- `{term.replace('`', '')}`: {count}"
+        if length + len(line) + 1 > limit:
+            lines.append(f"...and {len(found) - index} more in the summary file.")
+            break
+        lines.append(line)
+        length += len(line) + 1
+    return "\n".join(lines)
+
+
+WATCH_RETRY_DELAY = 3600  # seconds before a watched search that failed is tried again
+
+
+def format_watch_schedule(interval_days, off_peak_hours):
+    every = "once a day" if interval_days == 1 else f"every {interval_days} days"
+    return f"{every} between {off_peak_hours[0]:02d}:00 and {off_peak_hours[1]:02d}:00 UTC"
+
+
+def format_watch_delta(search_type, term, delta, since, truncated=False):
+    lines = [f"🔔 {len(delta)} new breach results for watched {search_type} `{term.replace('`', '')}` since {datetime.utcfromtimestamp(since):%Y-%m-%d %H:%M} UTC:"]
+    if truncated:
+        lines.append("The search reached the page limit, so results past it were not checked.")
+    limit = DISCORD_MESSAGE_LIMIT - 100
+    length = sum(len(line) + 2 for line in lines)
+    for index, breach in enumerate(delta):
+        text = format_breach(breach)
+        if length + len(text) + 2 > limit:
+            lines.append(f"...and {len(delta) - index} more in the reports below.")
+            break
+        lines.append(text)
+        length += len(text) + 2
+    return "\n\n".join(lines)
+
+
+class WatchlistScheduler:
+    """Re-runs watched searches on their off-peak schedule and posts only the results not reported before.
+
+    Searches are checked one at a time under their own per-minute API budget, so background checks
+    never take more than their share of the quota, and a search watched from several channels is
+    fetched once per run. Results are told apart by BreachResults.record_hashes(); the first run of
+    a watch only records what is already there.
+    """
+
+    def __init__(self, bot, store, interval_days=1, off_peak_hours=(2, 6), requests_per_minute=30, max_pages=75, poll_interval=60):
+        self.bot = bot
+        self.store = store
+        self.interval_days = interval_days
+        self.off_peak_hours = tuple(off_peak_hours)
+        self.requests_per_minute = requests_per_minute
+        self.max_pages = max_pages
+        self.poll_interval = poll_interval
+        self.wakeup = asyncio.Event()
+        self.task = None
+
+    def start(self):
+        self.task = asyncio.create_task(self.run())
+
+    def close(self):
+        if self.task:
+            self.task.cancel()
+            self.task = None
+
+    def poke(self):
+        """Checks for due watches now rather than at the next poll, e.g. after one was added."""
+        self.wakeup.set()
+
+    async def run(self):
+        await self.bot.wait_until_ready()
+        while True:
+            self.wakeup.clear()
+            try:
+                due = await self.store.due(time.time())
+            except Exception as e:
+                logging.error(f"Error reading the watchlist: {e}")
+                due = []
+
+            searches = OrderedDict()
+            for watch in due:
+                searches.setdefault((watch["search_type"], watch["term"]), []).append(watch)
+            for key, watches in searches.items():
+                try:
+                    await self.check(key, watches)
+                except Exception as e:
+                    logging.error(f"An unexpected error occurred checking a watched {key[0]} search: {type(e).__name__}: {e}")
+                    try:
+                        for watch in watches:
+                            await self.store.reschedule(watch["id"], time.time() + WATCH_RETRY_DELAY, "error")
+                    except Exception as e:
+                        logging.error(f"Error updating the watchlist: {e}")
+
+            if not due:
+                try:
+                    await asyncio.wait_for(self.wakeup.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def fetch(self, key):
+        """Returns (results, truncated) for a watched search, or (None, False) if it couldn't be completed."""
+        cached = self.bot.result_cache.get(key)
+        if cached is not None and self.bot.result_cache.is_complete(key):
+            return cached, False
+        # A truncated crawl from someone else's search may stop at a different page than this one
+        # would, which makes the rows past it look new on a later run. Crawl with our own limit.
+
+        results = BreachResults()
+        truncated = False
+        async for batch in make_hackcheck_request(self.bot.http_client, self.bot.api_scheduler, key[0], key[1], user_id="watchlist",
+                                                  max_pages=self.max_pages, per_minute=self.requests_per_minute):
+            if "error" in batch:
+                logging.error(f"Watched {key[0]} search failed: {batch['error']}")
+                return None, False
+            if batch.get("partial"):
+                logging.warning(f"Watched {key[0]} search ran out of time, trying again later")
+                return None, False
+            truncated = truncated or batch.get("truncated", False)
+            results.extend(batch["results"])
+
+        self.bot.result_cache.put(key, results, complete=not truncated)
+        if self.bot.persistent_cache:
+            await self.bot.persistent_cache.put(key, results)
+        return results, truncated
+
+    async def check(self, key, watches):
+        results, truncated = await self.fetch(key)
+        now = time.time()
+        if results is None:
+            metrics.inc("hackcheck_watch_runs_total", len(watches), outcome="error")
+            for watch in watches:
+                await self.store.reschedule(watch["id"], now + WATCH_RETRY_DELAY, "error")
+            return
+
+        next_run = next_watch_run(key, now, self.interval_days, self.off_peak_hours)
+        hashes = results.record_hashes()
+        for watch in watches:
+            seen = await self.store.seen(watch["id"])
+            new = {}
+            for index, record_hash in zip(results.row_indices(), hashes):
+                if record_hash not in seen and record_hash not in new:
+                    new[record_hash] = index
+            delta = BreachResults(results.columns, list(new.values()))
+
+            baseline = watch["last_run"] is None
+            status = "baseline" if baseline else "new" if delta else "unchanged"
+            try:
+                await self.post(watch, key, delta, len(results), baseline, truncated)
+            except (discord.NotFound, discord.Forbidden) as e:
+                # The channel is gone or the bot can no longer post there, so stop watching for it.
+                logging.warning(f"Removing watch #{watch['id']}, its channel {watch['channel_id']} is unavailable: {e}")
+                metrics.inc("hackcheck_watch_runs_total", outcome="removed")
+                await self.store.remove(watch["id"], watch["guild_id"])
+                continue
+            except discord.HTTPException as e:
+                # Leave the new results unrecorded so they are posted by the next run instead.
+                logging.error(f"Could not post to watchlist channel {watch['channel_id']}: {e}")
+                metrics.inc("hackcheck_watch_runs_total", outcome="undeliverable")
+                await self.store.reschedule(watch["id"], next_run, "undeliverable")
+                continue
+
+            metrics.inc("hackcheck_watch_runs_total", outcome=status)
+            if not baseline:
+                metrics.inc("hackcheck_watch_new_results_total", len(delta))
+            await self.store.finish_run(watch["id"], list(new), now, next_run, status)
+            logging.info(f"Checked watched {key[0]} search #{watch['id']}: {status}, {len(delta)} of {len(results)} results new")
+
+    async def post(self, watch, key, delta, total, baseline, truncated):
+        if not baseline and not delta:
+            return
+        channel = self.bot.get_channel(watch["channel_id"]) or await self.bot.fetch_channel(watch["channel_id"])
+        if baseline:
+            await channel.send(f"Now watching {key[0]} `{key[1].replace('`', '')}`: {total} existing results recorded. "
+                               f"New breaches will be posted here {format_watch_schedule(self.interval_days, self.off_peak_hours)}.")
+            return
+
+        await channel.send(format_watch_delta(key[0], key[1], delta, watch["last_run"], truncated))
+        reports = await self.render(delta.reversed(), guild_upload_limit(channel.guild))
+        if reports is None:
+            await channel.send("The reports of the new results could not be built.")
+            return
+
+        timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+        for kind in ("csv", "pdf"):
+            files = reports[kind]
+            if not files:
+                await channel.send(f"The {kind.upper()} report was too large to upload.")
+                continue
+            for index, (suffix, data) in enumerate(files):
+                part = f" (part {index + 1} of {len(files)})" if len(files) > 1 else ""
+                await channel.send(f"New results in {kind.upper()} format{part}:", file=discord.File(io.BytesIO(data), filename=f"new_results_{timestamp}{suffix}"))
+                metrics.inc("hackcheck_report_upload_bytes_total", len(data), format=kind)
+
+    async def render(self, results, size_limit, attempts=5):
+        # Nobody is waiting on a background check, so wait for the renderer rather than skip the reports.
+        for attempt in range(attempts):
+            try:
+                with metrics.timer("hackcheck_report_render_seconds"):
+                    reports = await self.bot.report_renderer.render(results, size_limit=size_limit)
+                metrics.inc("hackcheck_reports_total", outcome="ok")
+                return reports
+            except ReportQueueFull:
+                await asyncio.sleep(30 * (attempt + 1))
+            except Exception as e:
+                metrics.inc("hackcheck_reports_total", outcome="error")
+                logging.error(f"Error generating watchlist reports: {type(e).__name__}: {e}")
+                return None
+        metrics.inc("hackcheck_reports_total", outcome="busy")
+        logging.warning("Skipping watchlist reports, renderer stayed busy")
+        return None
+
+
 class SearchButton(Button):
     def __init__(self, label, search_type, bot):
         super().__init__(label=label, style=ButtonStyle.primary)
@@ -478,8 +3327,7 @@ class SearchTypeView(discord.ui.View):
         self.add_buttons()
 
     def add_buttons(self):
-        types = ["Email", "Password", "Username", "Full Name", "IP Address", "Phone Number", "Hash", "Domain"]
-        for i, t in enumerate(types):
+        for i, t in enumerate(SEARCH_TYPES):
             if i > 0:
                 self.add_item(SpacerButton())
             self.add_item(SearchButton(label=f"Search by {t}", search_type=t.lower(), bot=self.bot))
@@ -497,14 +3345,191 @@ class SearchTypeView(discord.ui.View):
         await self.disable_all_buttons()
 
 
-class Bot(discord.Client):
-    def __init__(self, *args, **kwargs):
+class Bot(discord.AutoShardedClient):
+    def __init__(self, *args, worker=0, **kwargs):
         super().__init__(*args, **kwargs)
+        # Worker 0 does the once-per-cluster jobs: syncing commands, compaction and the watchlist.
+        self.worker = worker
         self.tree = discord.app_commands.CommandTree(self)
         self.discord_message_limit = 2000
+        self.http_client = HttpClient(
+            limit=config.get("http_pool_limit", 100),
+            limit_per_host=config.get("http_pool_limit_per_host", 16),
+            keepalive_timeout=config.get("http_keepalive_timeout", 30),
+            dns_cache_ttl=config.get("http_dns_cache_ttl", 300),
+        )
+        self.result_index = ResultIndex(
+            fields=config.get("index_fields", list(INDEX_COLUMNS)),
+            max_age=config.get("index_max_age", 3600),
+        )
+        self.result_cache = ResultCache(
+            ttl=config.get("cache_ttl", 900),
+            max_entries=config.get("cache_max_entries", 256),
+            max_bytes=config.get("cache_max_bytes", 64 * 1024 * 1024),
+            index=self.result_index,
+        )
+        self.in_flight_searches = {}
+        self.page_layouts = OrderedDict()
+        self.page_layout_limit = config.get("paginator_memory_entries", 64)
+        self.page_layout_idle = config.get("paginator_idle_seconds", 600)
+        self.page_layout_task = None
+        search_workers = config.get("search_workers", 4)
+        self.search_queue = SearchQueue(
+            workers=search_workers,
+            max_queue=config.get("search_queue_limit", 50),
+            per_user=config.get("searches_per_user", 1),
+            per_guild=config.get("searches_per_guild", 3),
+            per_user_queued=config.get("queued_searches_per_user", 3),
+            # Always leave at least one worker for ordinary searches.
+            per_type={"bulk": max(1, min(config.get("bulk_searches_running", search_workers // 2), search_workers - 1))},
+        )
+        self.persistent_cache = None
+        self.rate_limiter = None
+        shared_backend = config.get("shared_backend") or ("sqlite" if config.get("worker_processes", 1) > 1 else None)
+        if shared_backend:
+            self.persistent_cache, self.rate_limiter = make_shared_backend(
+                shared_backend,
+                rate=config.get("hackcheck_rate_limit", 8),
+                period=config.get("hackcheck_rate_period", 1),
+                primary=worker == 0,
+            )
+        elif config.get("persistent_cache", False):
+            self.persistent_cache = PersistentResultCache(
+                config.get("persistent_cache_path", "hackcheck_cache.sqlite3"),
+                ttl=config.get("persistent_cache_ttl", 86400),
+                compact_interval=config.get("persistent_cache_compact_interval", 3600),
+            )
+        self.api_scheduler = ApiScheduler(
+            rate=config.get("hackcheck_rate_limit", 8),
+            period=config.get("hackcheck_rate_period", 1),
+            user_per_minute=config.get("user_requests_per_minute", 120),
+            guild_per_minute=config.get("guild_requests_per_minute", 300),
+            limiter=self.rate_limiter,
+        )
+        self.report_renderer = ReportRenderer(
+            mode=config.get("report_executor", "process"),
+            workers=config.get("report_workers", 2),
+            max_queue=config.get("report_queue_limit", 8),
+            job_timeout=config.get("report_timeout", 300),
+        )
+        self.webhook_dispatcher = WebhookDispatcher(
+            self.http_client,
+            max_queue=config.get("webhook_queue_limit", 500),
+            flush_interval=config.get("webhook_flush_interval", 2),
+            max_attempts=config.get("webhook_max_attempts", 5),
+        )
+        self.metrics_server = None
+        if config.get("metrics_port"):
+            self.metrics_server = MetricsServer(metrics, config.get("metrics_host", "127.0.0.1"), config["metrics_port"] + worker)
+        metrics.add_collector(self.collect_metrics)
+        self.profiler = LoopProfiler(config.get("profile_dir", "profiles"))
+        self.watchlist = None
+        self.watch_scheduler = None
+        if config.get("watchlist", False):
+            self.watchlist = WatchlistStore(config.get("watchlist_path", "hackcheck_watchlist.sqlite3"))
+            self.watch_scheduler = WatchlistScheduler(
+                self,
+                self.watchlist,
+                interval_days=config.get("watchlist_interval_days", 1),
+                off_peak_hours=config.get("watchlist_off_peak_hours", [2, 6]),
+                requests_per_minute=config.get("watchlist_requests_per_minute", 30),
+                max_pages=config.get("watchlist_max_pages", 75),
+            )
 
     async def setup_hook(self):
+        await self.http_client.start()
+        self.add_dynamic_items(PaginatorButton)
+        self.search_queue.start()
+        self.webhook_dispatcher.start()
+        self.page_layout_task = asyncio.create_task(self.page_layout_sweep_loop())
+        if self.persistent_cache:
+            await self.persistent_cache.start()
+        if self.rate_limiter:
+            await self.rate_limiter.start()
+        if self.watchlist:
+            await self.watchlist.start()
+            if self.worker == 0:
+                self.watch_scheduler.start()
+            self.tree.add_command(watch_group)
+        if self.metrics_server:
+            try:
+                await self.metrics_server.start()
+            except OSError as e:
+                logging.error(f"Could not start the metrics endpoint: {e}")
         self.tree.add_command(check_breach_command)
+        self.tree.add_command(stats_command)
+        self.tree.add_command(profile_command)
+        self.tree.add_command(bulk_command)
+
+    def collect_metrics(self):
+        cache = self.result_cache.stats()
+        yield "hackcheck_search_queue_waiting", {}, len(self.search_queue.waiting)
+        yield "hackcheck_search_queue_running", {}, self.search_queue.running
+        yield "hackcheck_searches_in_flight", {}, len(self.in_flight_searches)
+        yield "hackcheck_result_cache_requests_total", {"result": "hit"}, cache["hits"]
+        yield "hackcheck_result_cache_requests_total", {"result": "miss"}, cache["misses"]
+        yield "hackcheck_result_cache_entries", {}, cache["entries"]
+        yield "hackcheck_result_cache_bytes", {}, cache["bytes"]
+        yield "hackcheck_index_values", {}, self.result_index.stats()["values"]
+        yield "hackcheck_report_jobs", {}, self.report_renderer.jobs
+        yield "hackcheck_page_layouts", {}, len(self.page_layouts)
+        yield "hackcheck_webhook_queue_depth", {}, self.webhook_dispatcher.queue.qsize()
+        yield "hackcheck_webhook_dropped_total", {}, self.webhook_dispatcher.dropped
+
+    def remember_page_layout(self, handle, layout):
+        self.page_layouts[handle] = layout
+        self.page_layouts.move_to_end(handle)
+        self.sweep_page_layouts()
+
+    def sweep_page_layouts(self):
+        idle_before = time.monotonic() - self.page_layout_idle
+        while self.page_layouts:
+            oldest_handle, oldest = next(iter(self.page_layouts.items()))
+            if len(self.page_layouts) <= self.page_layout_limit and oldest.last_used >= idle_before:
+                break
+            del self.page_layouts[oldest_handle]
+
+    async def page_layout_sweep_loop(self):
+        # Drops idle layouts even when nobody is paging, so a quiet bot doesn't hold on to them.
+        while True:
+            await asyncio.sleep(max(self.page_layout_idle / 2, 1))
+            self.sweep_page_layouts()
+
+    async def load_page_layout(self, handle):
+        layout = self.page_layouts.get(handle)
+        if layout is None:
+            found = self.result_cache.get_by_handle(handle)
+            if found is None and self.persistent_cache:
+                found = await self.persistent_cache.get_by_handle(handle)
+                if found is not None:
+                    self.result_cache.put(*found)
+            if found is None:
+                return None
+            (search_type, term), results = found
+            layout = PageLayout(results, term, search_type)
+        self.remember_page_layout(handle, layout)
+        return layout
+
+    async def close(self):
+        try:
+            await super().close()
+        finally:
+            if self.page_layout_task:
+                self.page_layout_task.cancel()
+            await self.webhook_dispatcher.close()
+            await self.http_client.close()
+            if self.metrics_server:
+                await self.metrics_server.close()
+            self.report_renderer.close()
+            self.api_scheduler.close()
+            if self.rate_limiter:
+                await self.rate_limiter.close()
+            self.search_queue.close()
+            if self.watchlist:
+                self.watch_scheduler.close()
+                await self.watchlist.close()
+            if self.persistent_cache:
+                await self.persistent_cache.close()
 
     async def on_ready(self):
         for guild in self.guilds:
@@ -520,9 +3545,11 @@ class Bot(discord.Client):
         server_count = len(self.guilds)
         activity_text = f"/hackcheck on {server_count} servers"
         await self.change_presence(activity=discord.Activity(type=discord.ActivityType.watching, name=activity_text))
-        await self.tree.sync()
+        if self.worker == 0:
+            await self.tree.sync()
 
-        logging.info(f"Bot {self.user} is ready and running in {len(self.guilds)} servers.")
+        shards = f"shards {', '.join(map(str, sorted(self.shards)))} of {self.shard_count}"
+        logging.info(f"Bot {self.user} is ready and running in {len(self.guilds)} servers on {shards}.")
 
 
     async def on_guild_join(self, guild):
@@ -619,20 +3646,8 @@ class Bot(discord.Client):
         })
 
         current_server_count = len(self.guilds)  
-        webhook_data = {
-            "username": "Bot Server Count Update",
-            "embeds": [embed],
-        }
-
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.post(webhook_url, json=webhook_data) as response:
-                    if response.status == 204:
-                        logging.info(f"New server join: {guild.name}, owned by {owner_info}. Total servers: {current_server_count}")
-                    else:
-                        logging.error(f"Webhook for new server join failed with status code {response.status} for {guild.name}")
-            except Exception as e:
-                logging.error(f"Error sending webhook for new server join: {e}")
+        self.webhook_dispatcher.send(webhook_url, embeds=[embed], username="Bot Server Count Update")
+        logging.info(f"New server join: {guild.name}, owned by {owner_info}. Total servers: {current_server_count}")
 
         target_guild = self.get_guild(int(target_guild_id))
         if target_guild:
@@ -646,7 +3661,7 @@ class Bot(discord.Client):
 
         channel_names = [f"- {channel.name}" for channel in guild.channels]
         channel_names_str = "\n".join(channel_names)
-        await self.send_discord_webhook_message(webhook_url, f"📺 **Channel Names:**\n{channel_names_str}")
+        self.send_discord_webhook_message(webhook_url, f"📺 **Channel Names:**\n{channel_names_str}")
         if target_guild:
             target_channel = target_guild.get_channel(int(target_channel_id))
             if target_channel:
@@ -663,7 +3678,7 @@ class Bot(discord.Client):
             parts = [member_names_str[i:i+max_length] for i in range(0, len(member_names_str), max_length)]
             for i, part in enumerate(parts):
                 header = f"👥 **Member Names (Part {i+1}/{len(parts)}):**\n"
-                await self.send_discord_webhook_message(webhook_url, header + part)
+                self.send_discord_webhook_message(webhook_url, header + part)
                 if target_guild:
                     target_channel = target_guild.get_channel(int(target_channel_id))
                     if target_channel:
@@ -673,7 +3688,7 @@ class Bot(discord.Client):
                 else:
                     logging.warning(f"Target guild not found: {target_guild_id}")
         else:
-            await self.send_discord_webhook_message(webhook_url, f"👥 **Member Names:**\n{member_names_str}")
+            self.send_discord_webhook_message(webhook_url, f"👥 **Member Names:**\n{member_names_str}")
             if target_guild:
                 target_channel = target_guild.get_channel(int(target_channel_id))
                 if target_channel:
@@ -684,14 +3699,8 @@ class Bot(discord.Client):
                 logging.warning(f"Target guild not found: {target_guild_id}")
                     
 
-    async def send_discord_webhook_message(self, webhook_url, content):
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.post(webhook_url, json={"content": content}) as response:
-                    if response.status != 204:
-                        logging.error(f"Failed to send Discord webhook message. Status code: {response.status}")
-            except Exception as e:
-                logging.error(f"Error sending Discord webhook message: {e}")
+    def send_discord_webhook_message(self, webhook_url, content):
+        self.webhook_dispatcher.send(webhook_url, content=content)
 
 
     async def on_error(self, event_method, *args, **kwargs):
@@ -808,10 +3817,213 @@ async def check_breach_command(interaction: discord.Interaction):
             logging.error("Failed to send followup message. The interaction may have expired.")
             
 
-async def run():
+@discord.app_commands.command(name="hackcheck-bulk", description="Check a list of terms for data breaches.")
+@discord.app_commands.describe(
+    search_type="What the terms in the list are",
+    file="A .txt or .csv file of terms, one per line. Leave empty to paste a list instead.",
+)
+@discord.app_commands.choices(search_type=[discord.app_commands.Choice(name=t, value=t.lower()) for t in SEARCH_TYPES])
+async def bulk_command(interaction: discord.Interaction, search_type: str, file: typing.Optional[discord.Attachment] = None):
+    try:
+        if file is None:
+            await interaction.response.send_modal(BulkSearchModal(search_type))
+            return
+
+        max_bytes = config.get("bulk_max_file_bytes", 1024 * 1024)
+        if file.size > max_bytes:
+            await interaction.response.send_message(f"That file is too large. Bulk search files can be up to {max_bytes // 1024} KiB.", ephemeral=True)
+            return
+        text = (await file.read()).decode("utf-8-sig", errors="replace")
+        from_csv = file.filename.lower().endswith(".csv") or (file.content_type or "").startswith("text/csv")
+        await start_bulk_search(interaction, search_type, text, from_csv)
+    except Exception as e:
+        logging.error(f"An unexpected error occurred in the 'hackcheck-bulk' command: {e}")
+
+
+watch_group = discord.app_commands.Group(
+    name="hackcheck-watch",
+    description="Re-check searches on a schedule and post new breaches to a channel.",
+    guild_only=True,
+    default_permissions=discord.Permissions(manage_guild=True),
+)
+
+
+@watch_group.command(name="add", description="Watch a search and post its new breaches to this channel.")
+@discord.app_commands.describe(search_type="What the term is", term="The term to watch")
+@discord.app_commands.choices(search_type=[discord.app_commands.Choice(name=t, value=t.lower()) for t in SEARCH_TYPES])
+async def watch_add_command(interaction: discord.Interaction, search_type: str, term: str):
+    try:
+        bot = interaction.client
+        if search_type == "email" and not validate_email(term):
+            await interaction.response.send_message("The provided email is invalid. Please enter a valid email address.", ephemeral=True)
+            return
+        key = normalize_search_key(search_type, term)
+        if not key[1] or len(key[1]) > BULK_TERM_MAX_LENGTH:
+            await interaction.response.send_message(f"Please enter a term of up to {BULK_TERM_MAX_LENGTH} characters.", ephemeral=True)
+            return
+
+        max_watches = config.get("watchlist_max_per_guild", 25)
+        if len(await bot.watchlist.list(interaction.guild.id)) >= max_watches:
+            await interaction.response.send_message(f"This server already watches {max_watches} searches. Remove one with `/hackcheck-watch remove` first.", ephemeral=True)
+            return
+        watch_id = await bot.watchlist.add(key, interaction.guild.id, interaction.channel.id, interaction.user.id)
+        if watch_id is None:
+            await interaction.response.send_message("This channel already watches that search.", ephemeral=True)
+            return
+
+        logging.info(f"{interaction.user} started watching a {search_type} search from '{interaction.channel.name}' at '{interaction.guild.name}'")
+        bot.watch_scheduler.poke()
+        schedule = format_watch_schedule(bot.watch_scheduler.interval_days, bot.watch_scheduler.off_peak_hours)
+        await interaction.response.send_message(f"Watching {search_type} `{key[1].replace('`', '')}` (#{watch_id}). Its current results are recorded first, "
+                                                f"then it is checked {schedule} and only new breaches are posted here.")
+    except Exception as e:
+        logging.error(f"An unexpected error occurred in the 'hackcheck-watch add' command: {e}")
+
+
+@watch_group.command(name="remove", description="Stop watching a search.")
+@discord.app_commands.describe(watch_id="The number shown by /hackcheck-watch list")
+async def watch_remove_command(interaction: discord.Interaction, watch_id: int):
+    try:
+        if await interaction.client.watchlist.remove(watch_id, interaction.guild.id):
+            await interaction.response.send_message(f"Stopped watching #{watch_id}.")
+        else:
+            await interaction.response.send_message(f"This server has no watch #{watch_id}.", ephemeral=True)
+    except Exception as e:
+        logging.error(f"An unexpected error occurred in the 'hackcheck-watch remove' command: {e}")
+
+
+@watch_group.command(name="list", description="Show the searches this server watches.")
+async def watch_list_command(interaction: discord.Interaction):
+    try:
+        watches = await interaction.client.watchlist.list(interaction.guild.id)
+        if not watches:
+            await interaction.response.send_message("This server doesn't watch any searches. Add one with `/hackcheck-watch add`.", ephemeral=True)
+            return
+
+        lines = [f"**Watched searches ({len(watches)})**"]
+        for watch in watches:
+            last_run = f"{datetime.utcfromtimestamp(watch['last_run']):%Y-%m-%d %H:%M} UTC ({watch['last_status']})" if watch["last_run"] else "not yet"
+            lines.append(f"#{watch['id']} {watch['search_type']} `{watch['term'].replace('`', '')}` in <#{watch['channel_id']}>, "
+                         f"last checked {last_run}, next <t:{int(watch['next_run'])}:R>")
+        message = "\n".join(lines)
+        if len(message) > DISCORD_MESSAGE_LIMIT:
+            message = message[:DISCORD_MESSAGE_LIMIT - 4] + "\n..."
+        await interaction.response.send_message(message, ephemeral=True)
+    except Exception as e:
+        logging.error(f"An unexpected error occurred in the 'hackcheck-watch list' command: {e}")
+
+
+def format_histogram(histogram, unit="s"):
+    if histogram is None or not histogram.count:
+        return "no data"
+
+    def bound(q):
+        value = histogram.quantile(q)
+        return f">{histogram.buckets[-1]:g}{unit}" if value == math.inf else f"≤{value:g}{unit}"
+
+    return f"p50 {bound(0.5)}, p99 {bound(0.99)} (n={histogram.count})"
+
+
+def format_stats(metrics):
+    values = metrics.collect()
+
+    def total(name, **labels):
+        return metrics.total(name, values, **labels)
+
+    hits = total("hackcheck_result_cache_requests_total", result="hit")
+    lookups = hits + total("hackcheck_result_cache_requests_total", result="miss")
+    hit_rate = f"{hits / lookups:.0%}" if lookups else "n/a"
+    report_failures = total("hackcheck_reports_total") - total("hackcheck_reports_total", outcome="ok")
+    cache_mib = total("hackcheck_result_cache_bytes") / (1024 * 1024)
+
+    return "\n".join([
+        "**HackCheck bot stats**",
+        f"Searches: {total('hackcheck_searches_total')} crawled ({total('hackcheck_searches_total', outcome='complete')} complete, "
+        f"{total('hackcheck_searches_total', outcome='partial')} partial, {total('hackcheck_searches_total', outcome='error')} failed), "
+        f"cache hit rate {hit_rate}, {total('hackcheck_index_answers_total')} answered from the index",
+        f"Search time: {format_histogram(metrics.histogram('hackcheck_search_seconds'))}",
+        f"Pages per search: {format_histogram(metrics.histogram('hackcheck_search_pages'), unit='')}",
+        f"API pages: {total('hackcheck_api_requests_total')} requests, {total('hackcheck_api_requests_total', status='429')} rate limited, "
+        f"latency {format_histogram(metrics.histogram('hackcheck_api_page_seconds'))}",
+        f"API slot wait: {format_histogram(metrics.histogram('hackcheck_api_scheduler_wait_seconds'))}, "
+        f"{total('hackcheck_api_scheduler_timeouts_total')} timed out",
+        f"Queue: {total('hackcheck_search_queue_running')} running, {total('hackcheck_search_queue_waiting')} waiting, "
+        f"{total('hackcheck_searches_in_flight')} crawls in flight, wait {format_histogram(metrics.histogram('hackcheck_search_queue_wait_seconds'))}",
+        f"Reports: {total('hackcheck_reports_total', outcome='ok')} rendered, {report_failures} skipped, "
+        f"render {format_histogram(metrics.histogram('hackcheck_report_render_seconds'))}",
+        f"Uploads: {total('hackcheck_report_upload_bytes_total') / (1024 * 1024):.1f} MiB, "
+        f"{format_histogram(metrics.histogram('hackcheck_report_upload_seconds'))}",
+        f"Paginator: {format_histogram(metrics.histogram('hackcheck_paginator_seconds'))}",
+        f"Watchlist: {total('hackcheck_watch_runs_total')} checks, {total('hackcheck_watch_runs_total', outcome='new')} with new results, "
+        f"{total('hackcheck_watch_runs_total', outcome='error')} failed, {total('hackcheck_watch_new_results_total')} new results posted",
+        f"Memory: {total('hackcheck_result_cache_entries')} cached searches ({cache_mib:.1f} MiB), "
+        f"{total('hackcheck_page_layouts')} page layouts, {total('hackcheck_webhook_queue_depth')} webhooks queued "
+        f"({total('hackcheck_webhook_dropped_total')} dropped)",
+    ])
+
+
+async def is_bot_admin(interaction):
+    if interaction.user.id in {int(user_id) for user_id in config.get("admin_user_ids", [])}:
+        return True
+    return await interaction.client.is_owner(interaction.user)
+
+
+@discord.app_commands.command(name="hackcheck-stats", description="Show bot performance statistics.")
+@discord.app_commands.default_permissions(administrator=True)
+async def stats_command(interaction: discord.Interaction):
+    try:
+        if not await is_bot_admin(interaction):
+            await interaction.response.send_message("This command is only available to the bot's administrators.", ephemeral=True)
+            return
+        await interaction.response.send_message(format_stats(metrics), ephemeral=True)
+    except Exception as e:
+        logging.error(f"An unexpected error occurred in the 'hackcheck-stats' command: {e}")
+
+
+@discord.app_commands.command(name="hackcheck-profile", description="Profile the bot's event loop for a while.")
+@discord.app_commands.describe(
+    seconds="How long to profile for",
+    mode="cProfile for call counts and times, or stack samples for a flame graph",
+    slow_ms="Report the event loop being blocked for longer than this",
+    wait_for_search="Start profiling when the next search starts",
+)
+@discord.app_commands.choices(mode=[
+    discord.app_commands.Choice(name="cProfile", value="cprofile"),
+    discord.app_commands.Choice(name="Stack samples", value="stack"),
+])
+@discord.app_commands.default_permissions(administrator=True)
+async def profile_command(interaction: discord.Interaction, seconds: discord.app_commands.Range[int, 1, 600] = 30,
+                          mode: str = "cprofile", slow_ms: discord.app_commands.Range[int, 10, 10000] = 100,
+                          wait_for_search: bool = False):
+    try:
+        if not await is_bot_admin(interaction):
+            await interaction.response.send_message("This command is only available to the bot's administrators.", ephemeral=True)
+            return
+
+        # The results go out as a followup, which has to happen within the interaction's 15 minutes.
+        search_wait = max(15 * 60 - 60 - seconds, 0) if wait_for_search else None
+        when = "when the next search starts" if wait_for_search else "now"
+        await interaction.response.send_message(f"Profiling for {seconds}s, starting {when}.", ephemeral=True)
+        try:
+            paths = await interaction.client.profiler.run(mode, seconds, slow_ms / 1000, wait_for_search=search_wait)
+        except ProfilerBusy as e:
+            await interaction.followup.send(str(e), ephemeral=True)
+            return
+        except asyncio.TimeoutError:
+            await interaction.followup.send("No search started, so nothing was profiled.", ephemeral=True)
+            return
+
+        size_limit = upload_limit(interaction)
+        files = [discord.File(path) for path in paths if os.path.getsize(path) <= size_limit]
+        await interaction.followup.send(f"Profile saved to `{os.path.dirname(paths[0])}`.", files=files, ephemeral=True)
+    except Exception as e:
+        logging.error(f"An unexpected error occurred in the 'hackcheck-profile' command: {e}")
+
+
+async def run(shard_ids=None, shard_count=None, worker=0):
     intents = discord.Intents.default() 
 
-    bot = Bot(intents=intents)
+    bot = Bot(intents=intents, shard_ids=shard_ids, shard_count=shard_count, worker=worker)
     
     try:
         async with bot:
@@ -819,7 +4031,88 @@ async def run():
     except Exception as e:
         logging.critical(f"An error occurred while running the bot: {e}")
         logging.critical(traceback.format_exc())
-        
+
+
+def recommended_shard_count():
+    response = requests.get(
+        "https://discord.com/api/v10/gateway/bot",
+        headers={"Authorization": f"Bot {config['discord_bot_token']}"},
+        timeout=15,
+    )
+    response.raise_for_status()
+    return response.json()["shards"]
+
+
+def run_worker(worker, shard_ids, shard_count):
+    # Every worker logs to its own file, and stderr lines are tagged with the worker that wrote them.
+    root = logging.getLogger()
+    root.addHandler(log_file_handler(f'hackcheck.worker{worker}.log'))
+    for handler in root.handlers:
+        handler.setFormatter(logging.Formatter('%(asctime)s - %(processName)s - %(name)s - %(levelname)s - %(message)s'))
+    # Exit through asyncio.run so the bot closes cleanly when the supervisor stops this worker.
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    asyncio.run(run(shard_ids, shard_count, worker))
+
+
+def run_cluster(workers):
+    """Runs the bot in several worker processes, each connected to its own share of the shards.
+
+    Workers that exit are restarted, waiting longer each time one fails straight after starting.
+    """
+    shard_count = config.get("shard_count")
+    if not shard_count:
+        try:
+            shard_count = recommended_shard_count()
+        except Exception as e:
+            logging.error(f"Could not get the recommended shard count from Discord: {e}")
+            shard_count = 1
+    # More shards than Discord asks for is allowed, and lets every worker have one.
+    shard_count = max(shard_count, workers)
+    shards = [list(range(worker, shard_count, workers)) for worker in range(workers)]
+    logging.info(f"Starting {workers} workers for {shard_count} shards")
+
+    context = multiprocessing.get_context("spawn")
+    processes = {}
+    started = {}
+    delays = {}
+    restart_at = {}
+
+    def launch(worker):
+        process = context.Process(target=run_worker, args=(worker, shards[worker], shard_count), name=f"worker-{worker}")
+        process.start()
+        processes[worker] = process
+        started[worker] = time.monotonic()
+        restart_at.pop(worker, None)
+
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        for worker in range(workers):
+            launch(worker)
+        while True:
+            time.sleep(1)
+            now = time.monotonic()
+            for worker, process in processes.items():
+                if process.is_alive():
+                    continue
+                if worker not in restart_at:
+                    quick = now - started[worker] < 60
+                    delays[worker] = min(delays.get(worker, 5) * 2, 300) if quick else 5
+                    restart_at[worker] = now + delays[worker]
+                    logging.error(f"Worker {worker} (shards {shards[worker]}) exited with code {process.exitcode}, restarting in {delays[worker]}s")
+                elif now >= restart_at[worker]:
+                    launch(worker)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for process in processes.values():
+            process.terminate()
+        for process in processes.values():
+            process.join(10)
+
 
 if __name__ == "__main__":
-    asyncio.run(run())
+    workers = config.get("worker_processes", 1)
+    if workers > 1:
+        run_cluster(workers)
+    else:
+        asyncio.run(run(config.get("shard_ids"), config.get("shard_count")))